@@ -4,9 +4,12 @@ from Mendix.StudioPro.ExtensionsAPI.Model.Pages import IPage
 from Mendix.StudioPro.ExtensionsAPI.Model.DomainModels import IAttribute, IEntity
 from Mendix.StudioPro.ExtensionsAPI.Model import IStructure
 import clr
+import heapq
 import json
-from abc import ABC, abstractmethod
-from typing import List, Type, Optional
+import uuid
+from bisect import bisect_left
+from collections import defaultdict, deque
+from typing import Dict, Iterable, List, Type, Optional, Union
 
 # ================================================================================
 # PART 0: Mendix API Reference & Imports (Corrected as per Documentation)
@@ -14,6 +17,17 @@ from typing import List, Type, Optional
 
 # 文档参考 https://github.com/mendix/ExtensionAPI-Samples/tree/main/API%20Reference
 clr.AddReference("Mendix.StudioPro.ExtensionsAPI")
+clr.AddReference("System.Text.Json")
+from System.Text.Json import JsonSerializer
+
+try:
+    # orjson serializes in C; the plain dict/str payload needs no custom options.
+    import orjson
+
+    def _dumps(obj: object) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _dumps = json.dumps
 
 # IStructure: https://github.com/mendix/ExtensionAPI-Samples/tree/main/API%20Reference/Mendix.StudioPro.ExtensionsAPI.Model/IStructure.md
 # IAttribute: https://github.com/mendix/ExtensionAPI-Samples/tree/main/API%20Reference/Mendix.StudioPro.ExtensionsAPI.Model.DomainModels/IAttribute.md
@@ -32,61 +46,351 @@ clr.AddReference("Mendix.StudioPro.ExtensionsAPI")
 # ================================================================================
 
 
-class IElementAnalyzer(ABC):
+_GRAY, _BLACK = 1, 2
+
+
+def _materialize(enumerable: Optional[Iterable]) -> list:
+    """Walks a lazy CLR IEnumerable exactly once into a Python list."""
+    return list(enumerable) if enumerable is not None else []
+
+# Proxy type -> whether it exposes `.Module`. hasattr on a CLR proxy raises and
+# swallows an exception on every miss, so it is resolved once per type.
+_HAS_MODULE: Dict[type, bool] = {}
+
+# Proxy type -> type name, so the proxy's name is only introspected once per type.
+_TYPENAME: Dict[type, str] = {}
+
+
+def _tname(element: object) -> str:
+    element_type = type(element)
+    name = _TYPENAME.get(element_type)
+    if name is None:
+        name = _TYPENAME[element_type] = element_type.__name__
+    return name
+
+
+# Interface -> node group, checked in order.
+_GROUP_MAP: Dict[type, str] = {IMicroflow: 'microflow', IPage: 'page', IAttribute: 'attribute'}
+
+
+def _group_for(element: IStructure) -> str:
+    """Resolves the node group from the interfaces the element implements."""
+    return next((g for iface, g in _GROUP_MAP.items() if isinstance(element, iface)), 'default')
+
+
+# Pages with more nodes than this are sent column-wise (see `_to_columnar`).
+COLUMNAR_THRESHOLD = 200
+
+_GROUP_ENUM: Dict[str, int] = {'default': 0, 'microflow': 1, 'page': 2, 'attribute': 3, 'center': 4}
+
+
+def _to_columnar(nodes: List[dict], edges: List[dict]) -> dict:
+    """
+    Packs nodes and edges into parallel arrays, with groups as small ints indexed into
+    `groupNames`. Avoids repeating every key name and group string per record; the
+    frontend rebuilds the records once on receipt.
+    """
+    return {
+        'columnar': True,
+        'groupNames': list(_GROUP_ENUM),
+        'ids': [node['id'] for node in nodes],
+        'labels': [node['label'] for node in nodes],
+        'groups': [_GROUP_ENUM.get(node['group'], 0) for node in nodes],
+        'titles': [node['title'] for node in nodes],
+        'from': [edge['from'] for edge in edges],
+        'to': [edge['to'] for edge in edges],
+        'edgeLabels': [edge['label'] for edge in edges],
+        'cycleEdges': [i for i, edge in enumerate(edges) if edge.get('cycle')],
+    }
+
+
+def _strongly_connected_components(node_ids: List[str], edges: List[dict]) -> List[List[str]]:
+    """Iterative Tarjan's SCC. Returns only components that contain a cycle."""
+    successors: Dict[str, List[str]] = defaultdict(list)
+    for edge in edges:
+        successors[edge['from']].append(edge['to'])
+
+    index: Dict[str, int] = {}
+    low: Dict[str, int] = {}
+    stack: List[str] = []
+    on_stack: set = set()
+    components: List[List[str]] = []
+    for root in node_ids:
+        if root in index:
+            continue
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(successors[root]))]
+        while work:
+            node, pending = work[-1]
+            succ = next(pending, None)
+            if succ is not None:
+                if succ not in index:
+                    index[succ] = low[succ] = len(index)
+                    stack.append(succ)
+                    on_stack.add(succ)
+                    work.append((succ, iter(successors[succ])))
+                elif succ in on_stack:
+                    low[node] = min(low[node], index[succ])
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                if len(component) > 1 or node in successors[node]:
+                    components.append(component)
+    return components
+
+
+def _topological_order(nodes: List[dict], edges: List[dict]) -> List[dict]:
+    """
+    Orders nodes with Kahn's algorithm, starting from the center nodes so the analyzed
+    elements lead the order. When only cyclic nodes remain, the one with the smallest
+    in-degree from the remaining nodes is released next.
+    """
+    in_degree: Dict[str, int] = {node['id']: 0 for node in nodes}
+    successors: Dict[str, List[str]] = defaultdict(list)
+    for edge in edges:
+        source, target = edge['from'], edge['to']
+        if source in in_degree and target in in_degree:
+            successors[source].append(target)
+            in_degree[target] += 1
+
+    by_id = {node['id']: node for node in nodes}
+    position = {node_id: i for i, node_id in enumerate(in_degree)}
+    queue = deque(node['id'] for node in nodes if node['group'] == 'center')
+    queue.extend(node_id for node_id, degree in in_degree.items()
+                 if degree == 0 and by_id[node_id]['group'] != 'center')
+    # Cycle-breaker candidates as (in-degree, position, id). Entries go stale when a
+    # node is released or its in-degree drops, and are skipped when popped.
+    heap = [(degree, position[node_id], node_id) for node_id, degree in in_degree.items() if degree > 0]
+    heapq.heapify(heap)
+    ordered: List[dict] = []
+    while len(ordered) < len(nodes):
+        if not queue:
+            # Only cycle members are left; break the cycle at its cheapest entry point.
+            while True:
+                degree, _, node_id = heapq.heappop(heap)
+                if in_degree[node_id] == degree:
+                    break
+            queue.append(node_id)
+        node_id = queue.popleft()
+        if in_degree[node_id] < 0:
+            continue
+        in_degree[node_id] = -1
+        ordered.append(by_id[node_id])
+        for succ in successors[node_id]:
+            degree = in_degree[succ]
+            if degree > 0:
+                in_degree[succ] = degree - 1
+                if degree == 1:
+                    queue.append(succ)
+                else:
+                    heapq.heappush(heap, (degree - 1, position[succ], succ))
+    return ordered
+
+
+class IElementAnalyzer:
     """
     ABSTRACT STRATEGY: Defines the contract for an analysis "plugin".
+    A plain slotted class rather than an ABC, so instantiation skips ABCMeta's
+    abstract-method checks; subclasses declare `__slots__ = ()`.
     """
 
+    __slots__ = ('element', 'app', 'center_label', 'processed_ids', '_id_str_cache', '_color', '_edge_keys',
+                 '_node_ids', '_node_labels', '_node_groups', '_node_titles',
+                 '_edge_from', '_edge_to', '_edge_labels', '_edge_cycles')
+
+    # Process-wide FindUsages memo, keyed by element Id. FindUsages is a full
+    # cross-module CLR scan, so repeat lookups are served from here until
+    # AnalysisService clears it when a new analysis starts.
+    _usages_cache: Dict[str, list] = {}
+
+    # How many dependency hops `_expand` follows from the analyzed element.
+    max_depth: int = 1
+    # How many usage hops `_expand_usages` follows towards the analyzed element.
+    usage_depth: int = 1
+
     def __init__(self, element: IStructure, app: Object):
         self.element = element
         self.app = app
-        self.nodes: List[dict] = []
-        self.edges: List[dict] = []
+        # Label of the analyzed element, recorded when it is added as the center node.
+        self.center_label: Optional[str] = None
+        # Nodes and edges are accumulated column-wise and only turned into dicts
+        # by `_materialize_nodes` / `_materialize_edges` once the analysis is done.
+        self._node_ids: List[str] = []
+        self._node_labels: List[str] = []
+        self._node_groups: List[str] = []
+        self._node_titles: List[str] = []
+        self._edge_from: List[str] = []
+        self._edge_to: List[str] = []
+        self._edge_labels: List[str] = []
+        self._edge_cycles: List[bool] = []
+        self._edge_keys: set = set()
         self.processed_ids: set = set()
+        # id(element) -> (element, str(element.Id)). The element is kept alive so
+        # its id() cannot be reused by another proxy while this analyzer runs.
+        self._id_str_cache: Dict[int, tuple] = {}
+        # DFS colour per element Id for `_expand`: absent = unvisited, GRAY = on the
+        # current path, BLACK = fully expanded.
+        self._color: Dict[str, int] = {}
 
     @classmethod
-    @abstractmethod
     def can_handle(cls, element: IStructure) -> bool:
         """Determines if this analyzer is suitable for the given element."""
         raise NotImplementedError
 
-    @abstractmethod
     def analyze(self) -> tuple[List[dict], List[dict]]:
         """Performs the analysis and returns nodes and edges."""
         raise NotImplementedError
 
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drops all memoized FindUsages results."""
+        cls._usages_cache.clear()
+
     # --- Reusable helper methods ---
-    def _add_node(self, element: IStructure, group: str = 'default', is_center: bool = False):
-        element_id = str(element.Id)
+    def _sid(self, element: IStructure) -> str:
+        """Returns str(element.Id), converting across the CLR boundary only once per element."""
+        entry = self._id_str_cache.get(id(element))
+        if entry is None:
+            entry = self._id_str_cache[id(element)] = (element, str(element.Id))
+        return entry[1]
+
+    def _cached_find_usages(self, element: IStructure) -> list:
+        """Returns the usages of `element`, materialized once and memoized by Id."""
+        cache = IElementAnalyzer._usages_cache
+        element_id = self._sid(element)
+        usages = cache.get(element_id)
+        if usages is None:
+            usages = cache[element_id] = _materialize(element.FindUsages())
+        return usages
+
+    def _add_node(self, element: IStructure, group: str = 'default', is_center: bool = False) -> None:
+        element_id = self._sid(element)
         if element_id in self.processed_ids:
             return
 
-        label = element.Name
-        if hasattr(element, 'Module') and element.Module:
-            label = f"{element.Module.Name}.{element.Name}"
-
-        self.nodes.append({
-            'id': element_id, 'label': label, 'group': 'center' if is_center else group,
-            'title': f"Type: {type(element).__name__}<br>ID: {element.Id}"
-        })
+        element_type = type(element)
+        has_module = _HAS_MODULE.get(element_type)
+        if has_module is None:
+            has_module = _HAS_MODULE[element_type] = hasattr(element, 'Module')
+
+        # Each property read is a CLR call, so Name and Module are read once.
+        name = element.Name
+        module = element.Module if has_module else None
+        label = f"{module.Name}.{name}" if module else name
+        if is_center:
+            self.center_label = label
+
+        self._node_ids.append(element_id)
+        self._node_labels.append(label)
+        self._node_groups.append('center' if is_center else group)
+        self._node_titles.append(f"Type: {_tname(element)}<br>ID: {element_id}")
         self.processed_ids.add(element_id)
 
-    def _add_edge(self, source_elem: IStructure, target_elem: IStructure, label: str = ""):
-        self.edges.append({
-            'from': str(source_elem.Id), 'to': str(target_elem.Id), 'label': label
-        })
-
-
-class ISelectionProvider(ABC):
+    def _add_edge(self, source_elem: IStructure, target_elem: IStructure, label: str = "", cycle: bool = False) -> None:
+        sid = self._sid
+        source_id, target_id = sid(source_elem), sid(target_elem)
+        key = (source_id, target_id, label)
+        if key in self._edge_keys:
+            return
+        self._edge_keys.add(key)
+
+        self._edge_from.append(source_id)
+        self._edge_to.append(target_id)
+        self._edge_labels.append(label)
+        self._edge_cycles.append(cycle)
+
+    def _materialize_nodes(self) -> List[dict]:
+        return [{'id': i, 'label': l, 'group': g, 'title': t}
+                for i, l, g, t in zip(self._node_ids, self._node_labels, self._node_groups, self._node_titles)]
+
+    def _materialize_edges(self) -> List[dict]:
+        edges = [{'from': f, 'to': t, 'label': l}
+                 for f, t, l in zip(self._edge_from, self._edge_to, self._edge_labels)]
+        for edge, cycle in zip(edges, self._edge_cycles):
+            if cycle:
+                edge['cycle'] = True
+        return edges
+
+    def _expand_usages(self, root: IStructure, max_depth: int, label: str) -> None:
+        """
+        Breadth-first walk over FindUsages from `root`, up to `max_depth` hops. Direct
+        usages get `label`; usages of usages are linked with "uses".
+        """
+        sid = self._sid
+        add_node, add_edge = self._add_node, self._add_edge
+        expanded: set = {sid(root)}
+        frontier: deque = deque([(root, 0)])
+        while frontier:
+            element, depth = frontier.popleft()
+            for usage in self._cached_find_usages(element):
+                add_node(usage, group=_group_for(usage))
+                add_edge(usage, element, label=label if depth == 0 else "uses")
+                usage_id = sid(usage)
+                if depth + 1 < max_depth and usage_id not in expanded:
+                    expanded.add(usage_id)
+                    frontier.append((usage, depth + 1))
+
+    def _dependencies(self, element: IStructure, group: str) -> List[tuple]:
+        """Returns (target, group, label) for each outgoing dependency. Override to enable `_expand`."""
+        return []
+
+    def _expand(self, root: IStructure, max_depth: int, group: str = 'default') -> None:
+        """
+        Follows `_dependencies` from `root` up to `max_depth` hops with an iterative DFS.
+        Every element is expanded at most once; an edge back to an element still on the
+        current path is recorded as a cycle edge instead of being followed.
+        """
+        sid, color = self._sid, self._color
+        add_node, add_edge = self._add_node, self._add_edge
+        color[sid(root)] = _GRAY
+        stack: List[tuple] = [(root, 0, iter(self._dependencies(root, group)))]
+        while stack:
+            element, depth, pending = stack[-1]
+            step = next(pending, None)
+            if step is None:
+                color[sid(element)] = _BLACK
+                stack.pop()
+                continue
+
+            target, target_group, label = step
+            target_id = sid(target)
+            state = color.get(target_id)
+            add_node(target, group=target_group)
+            add_edge(element, target, label=label, cycle=state == _GRAY)
+            if state is None and depth + 1 < max_depth:
+                color[target_id] = _GRAY
+                stack.append((target, depth + 1, iter(self._dependencies(target, target_group))))
+
+
+class ISelectionProvider:
     """
     ABSTRACT PROVIDER: Defines the contract for how to get the element to be analyzed.
     This decouples the analysis service from the Studio Pro UI.
     """
-    @abstractmethod
+    __slots__ = ()
+
     def get_selected_element(self, app: Object) -> Optional[IStructure]:
         """Fetches the currently selected element from the host environment."""
         raise NotImplementedError
 
+    def get_selected_elements(self, app: Object) -> List[IStructure]:
+        """Fetches all selected elements. Defaults to the single-selection contract."""
+        element = self.get_selected_element(app)
+        return [element] if element else []
+
 
 class AnalysisService:
     """
@@ -96,23 +400,94 @@ class AnalysisService:
 
     def __init__(self, analyzers: List[Type[IElementAnalyzer]]):
         self._analyzers = analyzers
+        # Ordered result of the latest analysis; "Load More" pages are cut from it.
+        self._analysis: Optional[dict] = None
 
-    def run_analysis(self, element_to_analyze: Optional[IStructure], app: Object) -> dict:
-        """Finds the right analyzer and executes it on the provided element."""
-        if not element_to_analyze:
-            return {'status': "Please select a single element in the App Explorer."}
+    def _find_analyzer(self, element: IStructure) -> Optional[Type[IElementAnalyzer]]:
+        """Returns the first registered analyzer whose `can_handle` accepts the element."""
+        return next((a for a in self._analyzers if a.can_handle(element)), None)
 
-        for analyzer_class in self._analyzers:
-            if analyzer_class.can_handle(element_to_analyze):
-                analyzer_instance = analyzer_class(element_to_analyze, app)
-                nodes, edges = analyzer_instance.analyze()
+    def run_analysis(self, element_to_analyze: Union[IStructure, List[IStructure], None], app: Object,
+                     max_nodes: int = 500) -> dict:
+        """
+        Finds the right analyzer and executes it on the provided element.
+        A list of elements is handed to the analyzer's `analyze_batch` in one call.
 
-                center_label = f"{element_to_analyze.Module.Name}.{element_to_analyze.Name}"
-                return {
-                    'graph_data': {'nodes': nodes, 'edges': edges, 'centerNodeLabel': center_label}
-                }
+        Only the first `max_nodes` nodes are returned. The ordered result is kept, and
+        while the payload's `nextCursor` is set the frontend passes it to `next_page`
+        to fetch the following page and append it to the graph it already shows.
+        """
+        if isinstance(element_to_analyze, list):
+            elements = element_to_analyze
+        else:
+            elements = [element_to_analyze] if element_to_analyze else []
+        if not elements:
+            return {'status': "Please select a single element in the App Explorer."}
 
-        return {'status': f"Analysis for element type '{type(element_to_analyze).__name__}' is not supported."}
+        # The model may have been edited since the last analysis.
+        IElementAnalyzer.clear_cache()
+
+        first = elements[0]
+        analyzer_class = self._find_analyzer(first)
+        if analyzer_class is None:
+            return {'status': f"Analysis for element type '{_tname(first)}' is not supported."}
+
+        if len(elements) == 1:
+            analyzer_instance = analyzer_class(first, app)
+            nodes, edges = analyzer_instance.analyze()
+            center_label = analyzer_instance.center_label
+        else:
+            analyze_batch = getattr(analyzer_class, 'analyze_batch', None)
+            if analyze_batch is None or not all(self._find_analyzer(el) is analyzer_class for el in elements[1:]):
+                return {'status': "Batch analysis is only supported for elements of the same kind."}
+            nodes, edges = analyze_batch(elements, app)
+            center_label = ", ".join(el.Name for el in elements)
+
+        # Feeding vis.js nodes in dependency order gives it a stable, cheaper initial layout.
+        nodes = _topological_order(nodes, edges)
+
+        cycles = None
+        if any('cycle' in edge for edge in edges):
+            cycles = _strongly_connected_components([node['id'] for node in nodes], edges)
+
+        # Edges are sent with the page that delivers their later endpoint, so every
+        # edge arrives exactly once and only after both of its nodes. Sorting them by
+        # that endpoint lets each page take its edges as one slice.
+        position = {node['id']: i for i, node in enumerate(nodes)}
+        ranked = sorted(((max(position[edge['from']], position[edge['to']]), edge) for edge in edges),
+                        key=lambda item: item[0])
+        self._analysis = {
+            'id': uuid.uuid4().hex, 'centerNodeLabel': center_label, 'nodes': nodes, 'cycles': cycles,
+            'edges': [edge for _, edge in ranked], 'edgeRanks': [rank for rank, _ in ranked],
+        }
+        return self._page(0, max_nodes)
+
+    def next_page(self, cursor: Optional[str], max_nodes: int = 500) -> dict:
+        """Returns the page at `cursor` from the result of the latest analysis."""
+        analysis = self._analysis
+        analysis_id, _, offset = cursor.partition(':') if isinstance(cursor, str) else ('', '', '')
+        if (analysis is None or analysis_id != analysis['id'] or not offset.isdecimal()
+                or not 0 < int(offset) < len(analysis['nodes'])):
+            return {'status': "This result is no longer available. Please run the analysis again."}
+        return self._page(int(offset), max_nodes)
+
+    def _page(self, offset: int, max_nodes: int) -> dict:
+        analysis = self._analysis
+        nodes, edges, ranks = analysis['nodes'], analysis['edges'], analysis['edgeRanks']
+        end = offset + max_nodes
+        page_nodes = nodes[offset:end]
+        page_edges = edges[bisect_left(ranks, offset):bisect_left(ranks, end)]
+        graph_data = {
+            'centerNodeLabel': analysis['centerNodeLabel'], 'offset': offset, 'totalNodes': len(nodes),
+            'nextCursor': f"{analysis['id']}:{end}" if end < len(nodes) else None,
+        }
+        if len(page_nodes) > COLUMNAR_THRESHOLD:
+            graph_data.update(_to_columnar(page_nodes, page_edges))
+        else:
+            graph_data['nodes'], graph_data['edges'] = page_nodes, page_edges
+        if analysis['cycles']:
+            graph_data['cycles'] = analysis['cycles']
+        return {'graph_data': graph_data}
 
 # ================================================================================
 # PART 2: CONCRETE PROVIDER IMPLEMENTATION (User-defined)
@@ -125,6 +500,7 @@ class StudioProSelectionProvider(ISelectionProvider):
     A concrete implementation for getting the selected element from the Mendix
     Studio Pro App Explorer.
     """
+    __slots__ = ()
 
     def get_selected_element(self, app: Object) -> Optional[IStructure]:
         """
@@ -145,15 +521,28 @@ class StudioProSelectionProvider(ISelectionProvider):
             if hasattr(selection, 'SelectedElement') and selection.SelectedElement:
                 return selection.SelectedElement if isinstance(selection.SelectedElement, IStructure) else None
 
-            if hasattr(selection, 'SelectedElementsInAppExplorer') and selection.SelectedElementsInAppExplorer:
-                if len(selection.SelectedElementsInAppExplorer) == 1:
-                    element = selection.SelectedElementsInAppExplorer[0]
+            if hasattr(selection, 'SelectedElementsInAppExplorer'):
+                selected = _materialize(selection.SelectedElementsInAppExplorer)
+                if len(selected) == 1:
+                    element = selected[0]
                     return element if isinstance(element, IStructure) else None
 
             return None
         except Exception:
             return None
 
+    def get_selected_elements(self, app: Object) -> List[IStructure]:
+        """Returns a multi-selection from the App Explorer, else the single selected element."""
+        try:
+            selection = app.Selection
+            if selection and hasattr(selection, 'SelectedElementsInAppExplorer'):
+                elements = [el for el in _materialize(selection.SelectedElementsInAppExplorer) if isinstance(el, IStructure)]
+                if len(elements) > 1:
+                    return elements
+        except Exception:
+            pass
+        return super().get_selected_elements(app)
+
 # ================================================================================
 # PART 3: CONCRETE ANALYZER IMPLEMENTATIONS (User-defined)
 # These are the "plugins" for the analysis service.
@@ -161,6 +550,8 @@ class StudioProSelectionProvider(ISelectionProvider):
 
 
 class MicroflowAnalyzer(IElementAnalyzer):
+    __slots__ = ()
+
     @classmethod
     def can_handle(cls, element: IStructure) -> bool:
         return isinstance(element, IMicroflow)
@@ -168,40 +559,56 @@ class MicroflowAnalyzer(IElementAnalyzer):
     def analyze(self) -> tuple[List[dict], List[dict]]:
         self._add_node(self.element, group='microflow', is_center=True)
         # Usages
-        for usage in self.element.FindUsages():
-            self._add_node(usage, group=self._get_group(usage))
-            self._add_edge(usage, self.element, label="calls")
+        self._expand_usages(self.element, self.usage_depth, label="calls")
         # Dependencies
-        for activity in self.element.Activities:
+        self._expand(self.element, self.max_depth, group='microflow')
+        return self._materialize_nodes(), self._materialize_edges()
+
+    def _dependencies(self, element: IStructure, group: str) -> List[tuple]:
+        if group != 'microflow':
+            return []
+        dependencies = []
+        for activity in _materialize(element.Activities):
             if isinstance(activity, IMicroflowCall) and activity.Microflow:
-                self._add_node(activity.Microflow, group='microflow')
-                self._add_edge(self.element, activity.Microflow, label="calls")
+                dependencies.append((activity.Microflow, 'microflow', "calls"))
             elif isinstance(activity, IShowPageAction) and activity.Page:
-                self._add_node(activity.Page, group='page')
-                self._add_edge(self.element, activity.Page, label="shows")
-        return self.nodes, self.edges
-
-    def _get_group(self, e: IStructure) -> str:
-        if isinstance(e, IMicroflow):
-            return 'microflow'
-        if isinstance(e, IPage):
-            return 'page'
-        return 'default'
+                dependencies.append((activity.Page, 'page', "shows"))
+        return dependencies
 
 
 class AttributeAnalyzer(IElementAnalyzer):
+    __slots__ = ()
+
     @classmethod
     def can_handle(cls, element: IStructure) -> bool:
         return isinstance(element, IAttribute)
 
     def analyze(self) -> tuple[List[dict], List[dict]]:
         self._add_node(self.element, group='attribute', is_center=True)
-        for usage in self.element.FindUsages():
-            group = 'microflow' if isinstance(
-                usage, IMicroflow) else 'page' if isinstance(usage, IPage) else 'default'
-            self._add_node(usage, group=group)
-            self._add_edge(usage, self.element, label="uses")
-        return self.nodes, self.edges
+        self._expand_usages(self.element, self.usage_depth, label="uses")
+        return self._materialize_nodes(), self._materialize_edges()
+
+    @classmethod
+    def analyze_batch(cls, elements: List[IStructure], app: Object) -> tuple[List[dict], List[dict]]:
+        """
+        Analyzes several attributes into one graph. Usages are resolved once per
+        attribute into an index keyed by attribute Id, then emitted through a single
+        analyzer so usages shared between attributes become one node.
+        """
+        analyzer = cls(elements[0], app)
+        attributes = {analyzer._sid(attr): attr for attr in elements}
+
+        usage_index: Dict[str, list] = defaultdict(list)
+        for attr_id, attr in attributes.items():
+            usage_index[attr_id].extend(analyzer._cached_find_usages(attr))
+
+        add_node, add_edge = analyzer._add_node, analyzer._add_edge
+        for attr_id, attr in attributes.items():
+            add_node(attr, group='attribute', is_center=True)
+            for usage in usage_index[attr_id]:
+                add_node(usage, group=_group_for(usage))
+                add_edge(usage, attr, label="uses")
+        return analyzer._materialize_nodes(), analyzer._materialize_edges()
 
 # ================================================================================
 # PART 4: APPLICATION ENTRYPOINT & WIRING (Configuration)
@@ -226,15 +633,19 @@ analysis_service: AnalysisService = AnalysisService(REGISTERED_ANALYZERS)
 def onMessage(e: Object):
     """ Main message handler. Acts as a thin entry point. """
     try:
-        if e.Message == "frontend:analyze_selection":
-            selected_element = selection_provider.get_selected_element(
-                currentApp)
-            result = analysis_service.run_analysis(
-                selected_element, currentApp)
+        if e.Message in ("frontend:analyze_selection", "frontend:analyze_more"):
+            if e.Message == "frontend:analyze_more":
+                cursor = json.loads(JsonSerializer.Serialize(e.Data)).get('cursor')
+                result = analysis_service.next_page(cursor)
+            else:
+                selected_elements = selection_provider.get_selected_elements(
+                    currentApp)
+                result = analysis_service.run_analysis(
+                    selected_elements, currentApp)
 
             if 'graph_data' in result:
                 PostMessage("backend:graph_data",
-                            json.dumps(result['graph_data']))
+                            _dumps(result['graph_data']))
             elif 'status' in result:
                 PostMessage("backend:status", result['status'])
 
@@ -7,10 +7,12 @@ from Mendix.StudioPro.ExtensionsAPI.Model.UntypedModel import PropertyType
 import clr
 from dependency_injector import containers, providers
 import json
-from typing import Any, Dict, List, Set, Protocol
+import sys
+from typing import Any, Dict, List, Sequence, Set, Tuple, Protocol
 import traceback
-from collections import deque
-import inspect  # For automatic method discovery
+from collections import OrderedDict
+from array import array
+from itertools import compress
 
 # Mendix-specific setup
 PostMessage("backend:clear", '')
@@ -18,14 +20,18 @@ PostMessage("backend:clear", '')
 
 # Library imports
 clr.AddReference("Mendix.StudioPro.ExtensionsAPI")
+clr.AddReference("System.Text.Json")
+from System.Text.Json import JsonSerializer, JsonSerializerOptions
+
+# JsonSerializerOptions caches type metadata per instance, so one shared instance is reused.
+_JSON_OPTIONS = JsonSerializerOptions()
 
 
 # === 1. CORE UTILITIES ===
 
 def serialize_json_object(json_object: Any) -> str:
     """Serializes a Python object to a JSON string using .NET's serializer."""
-    import System.Text.Json
-    return System.Text.Json.JsonSerializer.Serialize(json_object)
+    return JsonSerializer.Serialize(json_object, _JSON_OPTIONS)
 
 
 def deserialize_json_string(json_string: str) -> Any:
@@ -33,11 +39,61 @@ def deserialize_json_string(json_string: str) -> Any:
     return json.loads(json_string)
 
 
+try:
+    # orjson encodes straight to UTF-8 bytes in C; responses are plain dicts/lists.
+    import orjson
+
+    def fast_dumps(obj: Any) -> str:
+        """Serializes an RPC response to a JSON string."""
+        return orjson.dumps(obj).decode()
+except ImportError:
+    fast_dumps = json.dumps
+
+
 def post_message(channel: str, message: str):
     """Posts a message to the frontend."""
     PostMessage(channel, message)
 
 
+class MessageBuffer:
+    """
+    Collects messages per channel and posts each channel's batch as one
+    newline-joined PostMessage, either when it fills up or on flush().
+    """
+
+    def __init__(self, limit: int = 64):
+        self._limit = limit
+        self._pending: Dict[str, List[str]] = {}
+
+    def post(self, channel: str, message: str):
+        batch = self._pending.setdefault(channel, [])
+        batch.append(message)
+        if len(batch) >= self._limit:
+            self.flush(channel)
+
+    def flush(self, channel: str | None = None):
+        channels = [channel] if channel is not None else list(self._pending)
+        for ch in channels:
+            batch = self._pending.pop(ch, None)
+            if batch:
+                PostMessage(ch, "\n".join(batch))
+
+
+def build_csr(node_count: int, sources: Sequence[int], targets: Sequence[int]):
+    """Packs an edge list into CSR arrays (indptr, indices), keeping edge order per source."""
+    indptr = array('i', bytes(4 * (node_count + 1)))
+    for s in sources:
+        indptr[s + 1] += 1
+    for i in range(node_count):
+        indptr[i + 1] += indptr[i]
+    fill = array('i', indptr[:-1])
+    indices = array('i', bytes(4 * len(sources)))
+    for s, t in zip(sources, targets):
+        indices[fill[s]] = t
+        fill[s] += 1
+    return indptr, indices
+
+
 # === 2. APPLICATION ABSTRACTIONS (Interfaces) ===
 # These define the "contracts" of our system. They are open for new implementations.
 
@@ -127,9 +183,35 @@ class MendixEditorActions(IEditorActions):
 
 
 class MendixTraceabilityAnalyzer(ITraceabilityAnalyzer):
+    QUERY_CACHE_SIZE = 128
+
     def __init__(self, root: Any):
         self._root = root
         self._full_graph_cache: Dict[str, Any] | None = None
+        # Query results keyed on normalized arguments; dropped whenever the graph is rebuilt.
+        self._query_cache: "OrderedDict[tuple, Any]" = OrderedDict()
+
+    def _cached_query(self, key: tuple, compute):
+        """Returns the cached result for `key`, computing and storing it (LRU) on a miss."""
+        self._build_graph_if_needed()
+        if key in self._query_cache:
+            self._query_cache.move_to_end(key)
+            return self._query_cache[key]
+        result = self._query_cache[key] = compute()
+        if len(self._query_cache) > self.QUERY_CACHE_SIZE:
+            self._query_cache.popitem(last=False)
+        return result
+
+    def _build_unit_lookup(self) -> Dict[str, Tuple[Any, bool]]:
+        """Qualified name -> (unit, is_page) for the pages and microflows of all modules, in a single pass."""
+        unit_lookup = {}
+        for m in self._root.GetUnitsOfType('Projects$Module'):
+            for p in m.GetUnitsOfType('Pages$Page'):
+                unit_lookup[sys.intern(p.QualifiedName)] = (p, True)
+            for mf in m.GetUnitsOfType('Microflows$Microflow'):
+                # A page keeps precedence should a microflow share its name.
+                unit_lookup.setdefault(sys.intern(mf.QualifiedName), (mf, False))
+        return unit_lookup
 
     def _build_graph_if_needed(self):
         if self._full_graph_cache is not None:
@@ -138,8 +220,9 @@ class MendixTraceabilityAnalyzer(ITraceabilityAnalyzer):
         # --- (The existing graph building logic from your code) ---
         nodes_map = {}
         edges_list = []
-        page_lookup = {p.QualifiedName: p for m in self._root.GetUnitsOfType('Projects$Module') for p in m.GetUnitsOfType('Pages$Page')}
-        microflow_lookup = {mf.QualifiedName: mf for m in self._root.GetUnitsOfType('Projects$Module') for mf in m.GetUnitsOfType('Microflows$Microflow')}
+        edge_set = set()  # (source, target, type) already in edges_list
+        # Built with the graph, so a rebuild sees the model as it is now.
+        unit_lookup = self._build_unit_lookup()
         
         # Helper functions adapted to be local
         def _get_or_create_node(q_name, type_override=None, name=None):
@@ -148,63 +231,79 @@ class MendixTraceabilityAnalyzer(ITraceabilityAnalyzer):
             parts = q_name.split('.')
             node = {"id": q_name, "type": type_override or "UNKNOWN", "name": name or parts[-1], "module": parts[0]}
             if not type_override:
-                if page_lookup.get(q_name): node["type"] = "PAGE"
-                elif microflow_lookup.get(q_name): node["type"] = "MICROFLOW"
+                entry = unit_lookup.get(q_name)
+                if entry: node["type"] = "PAGE" if entry[1] else "MICROFLOW"
             nodes_map[q_name] = node
 
         def _add_edge(source, target, type):
-            if source and target: edges_list.append({"source": source, "target": target, "type": type})
+            if not (source and target): return
+            key = (source, target, type)
+            if key in edge_set: return
+            edge_set.add(key)
+            edges_list.append({"source": source, "target": target, "type": type})
 
         def _get_property_value(el, prop):
+            if el is None:
+                return None
             p = el.GetProperty(prop)
-            return p.Value if p and p.Value else None
+            # .Value crosses into the CLR, so it is read once
+            value = p.Value if p else None
+            return value or None
 
         def _get_references_from_unit(unit, is_page):
             # ... (Same as your _get_references_from_unit)
-            refs = []
+            # Insertion-ordered dedup: keys are (target, edge type), values unused.
+            refs = {}
             if is_page:
                 for source in unit.GetElementsOfType('Pages$MicroflowSource'):
                     microflowSettings = _get_property_value(source, 'microflowSettings')
                     if microflowSettings:
                         microflow = _get_property_value(microflowSettings, 'microflow')
-                        refs.append((microflow, "CALLS"))
+                        refs[(microflow, "CALLS")] = None
             else: # Is Microflow
                 for call in unit.GetElementsOfType('Microflows$MicroflowCall'):
-                    if mf := _get_property_value(call, 'microflow'): refs.append((mf, "CALLS"))
+                    if mf := _get_property_value(call, 'microflow'): refs[(mf, "CALLS")] = None
                 for act in unit.GetElementsOfType('Microflows$ActionActivity'):
                     action = _get_property_value(act, 'action')
                     if action and action.Type == 'Microflows$ShowPageAction':
                         if page := _get_property_value(_get_property_value(action, 'pageSettings'), 'page'):
-                            refs.append((page, "SHOWS"))
-            return list(set(refs))
+                            refs[(page, "SHOWS")] = None
+            return refs
             
         # --- (The rest of the graph traversal logic) ---
         queue = []
         processed_items = set()
         # Seeding from navigation... (simplified)
         nav_docs = self._root.GetUnitsOfType('Navigation$NavigationDocument')
-        for nav_doc in nav_docs:
-            for profile in nav_doc.GetElementsOfType('Navigation$NavigationProfile'):
-                homePage = _get_property_value(profile, 'homePage')
-                home_page_name = _get_property_value(homePage, 'page')
-                if home_page_name:
-                    nav_id = f"Navigation.{profile.Name}"
-                    _get_or_create_node(nav_id, "NAVIGATION_ITEM", name=f"Home Page ({profile.Name})")
-                    _get_or_create_node(home_page_name, "PAGE")
-                    _add_edge(nav_id, home_page_name, "SHOWS")
-                    if home_page_name not in processed_items:
-                        queue.append(home_page_name)
-                        processed_items.add(home_page_name)
+        profiles = (profile for nav_doc in nav_docs
+                    for profile in nav_doc.GetElementsOfType('Navigation$NavigationProfile'))
+        for profile in profiles:
+            homePage = _get_property_value(profile, 'homePage')
+            if not homePage: continue
+            home_page_name = _get_property_value(homePage, 'page')
+            if not home_page_name: continue
+            home_page_name = sys.intern(home_page_name)
+            profile_name = profile.Name
+            nav_id = sys.intern(f"Navigation.{profile_name}")
+            _get_or_create_node(nav_id, "NAVIGATION_ITEM", name=f"Home Page ({profile_name})")
+            _get_or_create_node(home_page_name, "PAGE")
+            _add_edge(nav_id, home_page_name, "SHOWS")
+            if home_page_name not in processed_items:
+                queue.append(home_page_name)
+                processed_items.add(home_page_name)
         
         # Traversing...
         head = 0
         while head < len(queue):
             current_id = queue[head]; head += 1
-            unit = page_lookup.get(current_id) or microflow_lookup.get(current_id)
-            if not unit: continue
-            references = _get_references_from_unit(unit, current_id in page_lookup)
+            entry = unit_lookup.get(current_id)
+            if entry is None: continue
+            unit, is_page = entry
+            references = _get_references_from_unit(unit, is_page)
             for ref_id, edge_type in references:
                 if ref_id:
+                    # Interned once here, so every dict/set/list below shares one string object.
+                    ref_id = sys.intern(ref_id)
                     _get_or_create_node(ref_id)
                     _add_edge(current_id, ref_id, edge_type)
                     if ref_id not in processed_items:
@@ -212,17 +311,24 @@ class MendixTraceabilityAnalyzer(ITraceabilityAnalyzer):
                         processed_items.add(ref_id)
         
         # --- Create efficient lookup structures and cache ---
+        self._query_cache.clear()
         self._full_graph_cache = {
             "nodes": list(nodes_map.values()),
             "edges": edges_list
         }
         self._nodes_by_id = {node['id']: node for node in self._full_graph_cache['nodes']}
-        # Adjacency lists for fast traversal
-        self._adj = {node['id']: [] for node in self._full_graph_cache['nodes']}
-        self._rev_adj = {node['id']: [] for node in self._full_graph_cache['nodes']}
-        for edge in edges_list:
-            if edge['source'] in self._adj: self._adj[edge['source']].append(edge['target'])
-            if edge['target'] in self._rev_adj: self._rev_adj[edge['target']].append(edge['source'])
+        # Traversals run on contiguous int indices: CSR arrays for both edge directions.
+        self._id_list = [node['id'] for node in self._full_graph_cache['nodes']]
+        self._index = {node_id: i for i, node_id in enumerate(self._id_list)}
+        # The CSR arrays themselves are built on first traversal in each direction (see _csr).
+        self._edge_sources = array('i', [self._index[edge['source']] for edge in edges_list])
+        self._edge_targets = array('i', [self._index[edge['target']] for edge in edges_list])
+        self._fwd = None
+        self._rev = None
+        # Source id -> positions in edges_list, so subgraphs only touch the selected nodes' edges.
+        self._edges_by_source: Dict[str, List[int]] = {}
+        for i, edge in enumerate(edges_list):
+            self._edges_by_source.setdefault(edge['source'], []).append(i)
 
     # --- Public API Methods ---
     def get_full_graph(self) -> Dict[str, Any]:
@@ -230,87 +336,142 @@ class MendixTraceabilityAnalyzer(ITraceabilityAnalyzer):
         return self._full_graph_cache
 
     def find_paths(self, start_node_id: str, end_node_id: str) -> List[List[Dict[str, Any]]]:
-        self._build_graph_if_needed()
-        # Using BFS to find the shortest path for simplicity
-        if start_node_id not in self._adj or end_node_id not in self._adj:
-            return []
-        queue = deque([(start_node_id, [start_node_id])])
-        visited = {start_node_id}
-        
-        while queue:
-            current_node, path = queue.popleft()
-            if current_node == end_node_id:
-                return [[self._nodes_by_id.get(node_id) for node_id in path if self._nodes_by_id.get(node_id)]]
-
-            for neighbor in self._adj.get(current_node, []):
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    new_path = list(path)
-                    new_path.append(neighbor)
-                    queue.append((neighbor, new_path))
-        return [] # No path found
-
-    def _traverse(self, start_nodes: List[str], forward: bool = True) -> Set[str]:
-        adj_list = self._adj if forward else self._rev_adj
-        all_related = set()
-        for start_node in start_nodes:
-            q = deque([start_node])
-            visited = {start_node}
-            while q:
-                curr = q.popleft()
-                for neighbor in adj_list.get(curr, []):
-                    if neighbor not in visited:
-                        visited.add(neighbor)
-                        q.append(neighbor)
-            all_related.update(visited)
-        return all_related
+        return self._cached_query(("paths", start_node_id, end_node_id),
+                                  lambda: self._compute_paths(start_node_id, end_node_id))
 
     def find_common_upstream(self, node_ids: List[str]) -> Dict[str, Any]:
-        self._build_graph_if_needed()
-        if not node_ids: return {"nodes": [], "edges": []}
-        
-        ancestor_sets = []
-        for node_id in node_ids:
-            ancestors = self._traverse([node_id], forward=False)
-            ancestor_sets.append(ancestors)
-            
-        common_ancestors_ids = set.intersection(*ancestor_sets)
-        # We should not include the selected nodes themselves in the result
-        common_ancestors_ids = common_ancestors_ids - set(node_ids)
-
-        return self.get_subgraph(list(common_ancestors_ids))
+        return self._cached_query(("upstream", frozenset(node_ids)),
+                                  lambda: self._compute_common(node_ids, forward=False))
 
     def find_common_downstream(self, node_ids: List[str]) -> Dict[str, Any]:
-        self._build_graph_if_needed()
-        if not node_ids: return {"nodes": [], "edges": []}
-        
-        descendant_sets = []
-        for node_id in node_ids:
-            descendants = self._traverse([node_id], forward=True)
-            descendant_sets.append(descendants)
-            
-        common_descendants_ids = set.intersection(*descendant_sets)
-        common_descendants_ids = common_descendants_ids - set(node_ids)
-
-        return self.get_subgraph(list(common_descendants_ids))
+        return self._cached_query(("downstream", frozenset(node_ids)),
+                                  lambda: self._compute_common(node_ids, forward=True))
 
     def get_subgraph(self, node_ids: List[str]) -> Dict[str, Any]:
-        self._build_graph_if_needed()
-        node_id_set = set(node_ids)
-        subgraph_nodes = [node for node in self._full_graph_cache['nodes'] if node['id'] in node_id_set]
-        subgraph_edges = [edge for edge in self._full_graph_cache['edges'] if edge['source'] in node_id_set and edge['target'] in node_id_set]
+        return self._cached_query(("subgraph", frozenset(node_ids)),
+                                  lambda: self._compute_subgraph(node_ids))
+
+    # --- Query implementations (uncached) ---
+    def _csr(self, forward: bool):
+        """Returns the (indptr, indices) arrays for one edge direction, building them on first use."""
+        if forward:
+            if self._fwd is None:
+                self._fwd = build_csr(len(self._id_list), self._edge_sources, self._edge_targets)
+            return self._fwd
+        if self._rev is None:
+            self._rev = build_csr(len(self._id_list), self._edge_targets, self._edge_sources)
+        return self._rev
+
+    def _compute_paths(self, start_node_id: str, end_node_id: str) -> List[List[Dict[str, Any]]]:
+        # Using BFS to find the shortest path for simplicity
+        start, end = self._index.get(start_node_id), self._index.get(end_node_id)
+        if start is None or end is None:
+            return []
+        indptr, indices = self._csr(forward=True)
+        # Unboxed int queue with a head index instead of a deque of Python ints.
+        queue = array('i', [start])
+        head = 0
+        # Parent pointers double as the visited set; the path is rebuilt once at the end.
+        parents = array('i', [-1]) * len(self._id_list)
+        parents[start] = start
+
+        while head < len(queue):
+            current = queue[head]; head += 1
+            if current == end:
+                path = [current]
+                while current != start:
+                    current = parents[current]
+                    path.append(current)
+                path.reverse()
+                return [[self._nodes_by_id[self._id_list[i]] for i in path]]
+
+            for k in range(indptr[current], indptr[current + 1]):
+                neighbor = indices[k]
+                if parents[neighbor] < 0:
+                    parents[neighbor] = current
+                    queue.append(neighbor)
+        return [] # No path found
+
+    def _traverse(self, start: int, forward: bool = True, within: bytearray | None = None) -> bytearray:
+        """BFS from `start`; returns a mask of reached nodes, limited to `within` if given.
+
+        With `within`, the traversal stops once every node in it has been reached.
+        """
+        indptr, indices = self._csr(forward)
+        visited = bytearray(len(self._id_list))
+        visited[start] = 1
+        if within is None:
+            hits, remaining = visited, -1
+        else:
+            hits = bytearray(len(visited))
+            remaining = within.count(1)
+            if within[start]:
+                hits[start] = 1
+                remaining -= 1
+        q = array('i', [start])
+        head = 0
+        while head < len(q) and remaining != 0:
+            curr = q[head]; head += 1
+            for k in range(indptr[curr], indptr[curr + 1]):
+                neighbor = indices[k]
+                if not visited[neighbor]:
+                    visited[neighbor] = 1
+                    q.append(neighbor)
+                    if within is not None and within[neighbor]:
+                        hits[neighbor] = 1
+                        remaining -= 1
+        return hits
+
+    def _common_reachable(self, node_ids: List[str], forward: bool) -> Set[str]:
+        """Intersects the reachable sets of all nodes, traversing one node at a time.
+
+        Later traversals only record nodes still in the running intersection and
+        stop as soon as all of them have been reached.
+        """
+        if any(node_id not in self._index for node_id in node_ids):
+            # An unknown node reaches nothing but itself, so nothing is shared.
+            return set()
+        common = self._traverse(self._index[node_ids[0]], forward)
+        for node_id in node_ids[1:]:
+            if 1 not in common:
+                break
+            common = self._traverse(self._index[node_id], forward, within=common)
+        return set(compress(self._id_list, common))
+
+    def _compute_common(self, node_ids: List[str], forward: bool) -> Dict[str, Any]:
+        if not node_ids: return {"nodes": [], "edges": []}
+
+        common_ids = self._common_reachable(node_ids, forward=forward)
+        # We should not include the selected nodes themselves in the result
+        common_ids = common_ids - set(node_ids)
+
+        return self._compute_subgraph(common_ids)
+
+    def _compute_subgraph(self, node_ids) -> Dict[str, Any]:
+        # Sorting by build position keeps the output in the same order as the full graph.
+        node_id_set = {node_id for node_id in node_ids if node_id in self._index}
+        selected = sorted(node_id_set, key=self._index.__getitem__)
+        edges = self._full_graph_cache['edges']
+        edge_positions = sorted(i for node_id in selected for i in self._edges_by_source.get(node_id, ())
+                                if edges[i]['target'] in node_id_set)
+        subgraph_nodes = [self._nodes_by_id[node_id] for node_id in selected]
+        subgraph_edges = [edges[i] for i in edge_positions]
         return {"nodes": subgraph_nodes, "edges": subgraph_edges}
 
 # === 4. RPC LAYER (Application's Public API) ===
 # This layer is now modular and adheres to the Open/Closed Principle.
 
 class IRpcModule(Protocol):
-    """A marker protocol that identifies a class as a provider of RPC methods."""
-    pass
+    """
+    A protocol that identifies a class as a provider of RPC methods.
+    Each module lists the methods it exposes in `_RPC_METHODS`.
+    """
+    _RPC_METHODS: tuple = ()
 
 
 class CoreElementRpcModule(IRpcModule):
     """Handles core element retrieval and editor actions."""
+    _RPC_METHODS = ('getAllElements', 'getElementDetails', 'locateElement')
 
     def __init__(self, retriever: IElementRetriever, editor: IEditorActions, mapper: IElementMapper):
         self._retriever = retriever
@@ -331,6 +492,8 @@ class CoreElementRpcModule(IRpcModule):
 
 class TraceabilityRpcModule(IRpcModule):
     """Handles traceability graph analysis."""
+    _RPC_METHODS = ('getTraceabilityGraph', 'findPaths', 'findCommonUpstream',
+                    'findCommonDownstream', 'getSubgraph')
 
     def __init__(self, analyzer: ITraceabilityAnalyzer):
         self._analyzer = analyzer
@@ -353,21 +516,22 @@ class TraceabilityRpcModule(IRpcModule):
 
 class RpcDispatcher:
     """
-    Generic dispatcher for RPC calls. It discovers and registers public methods from
-    all provided RPC modules. This class is now completely closed for modification.
+    Generic dispatcher for RPC calls. It registers the methods each provided RPC
+    module declares in `_RPC_METHODS`. This class is now completely closed for modification.
     """
 
     def __init__(self, modules: List[IRpcModule]):
         self._methods: Dict[str, Any] = {}
+        log = MessageBuffer()
         for module_instance in modules:
-            for name, method in inspect.getmembers(module_instance, predicate=inspect.ismethod):
-                if not name.startswith('_'):
-                    if name in self._methods:
-                        PostMessage(
-                            "backend:info", f"Warning: RPC method name collision for '{name}'. Overwriting.")
-                    self._methods[name] = method
-        PostMessage(
+            for name in module_instance._RPC_METHODS:
+                if name in self._methods:
+                    log.post(
+                        "backend:info", f"Warning: RPC method name collision for '{name}'. Overwriting.")
+                self._methods[name] = getattr(module_instance, name)
+        log.post(
             "backend:info", f"Dispatcher initialized with methods: {list(self._methods.keys())}")
+        log.flush()
 
     def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
         method_name = request.get('method')
@@ -442,21 +606,30 @@ container = AppContainer()
 # The global 'root' object from the Mendix environment is injected here.
 container.config.mendix_root.from_value(root)
 
-# The dispatcher is now fully wired by the container. No manual registration is needed.
-dispatcher_instance = container.dispatcher()
+# The dispatcher is wired by the container on the first incoming message, so loading
+# the plugin does not pay for building the RPC modules. No manual registration is needed.
+dispatcher_instance: RpcDispatcher | None = None
+
+
+def get_dispatcher() -> RpcDispatcher:
+    """Returns the dispatcher, building it from the container on first use."""
+    global dispatcher_instance
+    if dispatcher_instance is None:
+        dispatcher_instance = container.dispatcher()
+    return dispatcher_instance
 
 
 def onMessage(e: Any):
     """Main message handler, delegates all incoming requests to the dispatcher."""
     if e.Message == "frontend:message":
         try:
-            # The serialization dance is necessary due to the IronPython environment
-            message_data = deserialize_json_string(serialize_json_object(e))
+            # Only the payload crosses the .NET boundary; the event wrapper itself is never serialized.
+            data = e.Data
+            request_object = deserialize_json_string(serialize_json_object(data)) if data is not None else None
             # Pass the RPC request object to the dispatcher for handling
-            request_object = message_data.get("Data")
             if request_object:
-                response = dispatcher_instance.handle_request(request_object)
-                post_message("backend:response", json.dumps(response))
+                response = get_dispatcher().handle_request(request_object)
+                post_message("backend:response", fast_dumps(response))
             else:
                 PostMessage("backend:info",
                             "Received message with no 'Data' field.")
@@ -23,7 +23,16 @@ def print(e):
 # ==========================================
 
 PostMessage("backend:clear", "")
-PostMessage("backend:info", "=== 开始硬编码调试 (兼容版) ===")
+
+# 步骤日志先缓存在本地，脚本结束时一次性发送，减少 PostMessage 跨进程调用次数
+info_lines = []
+
+
+def info(msg):
+    info_lines.append(msg)
+
+
+info("=== 开始硬编码调试 (兼容版) ===")
 
 try:
     # 目标定义
@@ -31,12 +40,12 @@ try:
     TARGET_DOC = "Login"
     TARGET_WIDGET = "container11"
 
-    PostMessage("backend:info", "目标: " + TARGET_MODULE + "." + TARGET_DOC + "." + TARGET_WIDGET)
+    info("目标: " + TARGET_MODULE + "." + TARGET_DOC + "." + TARGET_WIDGET)
 
     # -------------------------------------------------
     # 步骤 1: 查找 Module
     # -------------------------------------------------
-    PostMessage("backend:info", "步骤 1: 查找 Module...")
+    info("步骤 1: 查找 Module...")
     found_module = None
     for m in currentApp.Root.GetModules():
         if m.Name == TARGET_MODULE:
@@ -46,12 +55,12 @@ try:
     if not found_module:
         raise Exception("找不到模块: " + TARGET_MODULE)
     
-    PostMessage("backend:info", "✅ 成功找到模块: " + found_module.Name)
+    info("✅ 成功找到模块: " + found_module.Name)
 
     # -------------------------------------------------
     # 步骤 2: 查找 Document (Page)
     # -------------------------------------------------
-    PostMessage("backend:info", "步骤 2: 查找 Document...")
+    info("步骤 2: 查找 Document...")
     
     def find_document_recursive(folder, doc_name):
         for d in folder.GetDocuments():
@@ -66,37 +75,29 @@ try:
     if not found_doc:
         raise Exception("找不到文档: " + TARGET_DOC)
         
-    PostMessage("backend:info", "✅ 成功找到文档: " + found_doc.Name)
+    info("✅ 成功找到文档: " + found_doc.Name)
 
     # -------------------------------------------------
-    # 步骤 3: 查找 Widget (使用字典上下文避免 nonlocal 问题)
+    # 步骤 3: 查找 Widget (显式栈迭代，避免递归与逐节点消息)
     # -------------------------------------------------
-    PostMessage("backend:info", "步骤 3: 深度查找 Widget...")
+    info("步骤 3: 深度查找 Widget...")
     
-    # 上下文容器
-    ctx = {
-        "found_widget": None,
-        "visited_count": 0
-    }
-
-    def find_widget_recursive(node, target_name, depth):
-        # 如果已经找到，直接返回
-        if ctx["found_widget"]: return 
-
-        ctx["visited_count"] += 1
-        
-        # 获取名称
-        current_name = getattr(node, "Name", "")
-        # node_type = str(node.GetType().Name) if hasattr(node, "GetType") else "Unknown"
-
-        PostMessage("backend:info", "   [" + str(depth) + "] 扫描: " + current_name)
-
-        if current_name == target_name:
-            ctx["found_widget"] = node
-            return
-
-        # 遍历属性
-        if hasattr(node, "GetProperties"):
+    def find_widget(root_node, target_name):
+        """迭代深度优先查找 (显式栈)，找到即返回；返回 (组件, 已扫描节点数)"""
+        visited_count = 0
+        stack = [root_node]
+        while stack:
+            node = stack.pop()
+            visited_count += 1
+
+            if getattr(node, "Name", "") == target_name:
+                return node, visited_count
+
+            if not hasattr(node, "GetProperties"):
+                continue
+
+            # 收集子节点后逆序入栈，保持与递归版本相同的访问顺序
+            children = []
             for prop in node.GetProperties():
                 val = prop.Value
                 if not val: continue
@@ -105,38 +106,39 @@ try:
                 if isinstance(val, IEnumerable) and not isinstance(val, str):
                     for item in val:
                         if hasattr(item, "GetProperties"):
-                            find_widget_recursive(item, target_name, depth + 1)
-                            if ctx["found_widget"]: return
-                
+                            children.append(item)
+
                 # 单对象类型
                 elif hasattr(val, "GetProperties"):
-                    find_widget_recursive(val, target_name, depth + 1)
-                    if ctx["found_widget"]: return
+                    children.append(val)
+            children.reverse()
+            stack.extend(children)
+        return None, visited_count
 
     # 开始查找
-    find_widget_recursive(found_doc, TARGET_WIDGET, 0)
-    
-    found_widget = ctx["found_widget"]
+    found_widget, visited_count = find_widget(found_doc, TARGET_WIDGET)
 
     if found_widget:
-        PostMessage("backend:info", "✅ 成功找到组件: " + found_widget.Name)
+        info("✅ 成功找到组件: " + found_widget.Name + " (扫描了 " + str(visited_count) + " 个节点)")
     else:
-        PostMessage("backend:info", "⚠️ 未找到组件 '" + TARGET_WIDGET + "' (扫描了 " + str(ctx["visited_count"]) + " 个节点)")
+        info("⚠️ 未找到组件 '" + TARGET_WIDGET + "' (扫描了 " + str(visited_count) + " 个节点)")
 
     # -------------------------------------------------
     # 步骤 4: 执行打开
     # -------------------------------------------------
-    PostMessage("backend:info", "步骤 4: 调用 Studio Pro 编辑器...")
+    info("步骤 4: 调用 Studio Pro 编辑器...")
 
     if found_widget:
-        PostMessage("backend:info", "执行模式: 打开文档并选中组件")
+        info("执行模式: 打开文档并选中组件")
         dockingWindowService.TryOpenEditor(found_doc, found_widget)
     else:
-        PostMessage("backend:info", "执行模式: 仅打开文档 (Fallback)")
+        info("执行模式: 仅打开文档 (Fallback)")
         dockingWindowService.TryOpenEditor(found_doc)
 
-    PostMessage("backend:info", "🎉 API 调用完成")
+    info("🎉 API 调用完成")
 
 except Exception as e:
-    PostMessage("backend:info", "❌ 严重错误: " + str(e))
-    PostMessage("backend:info", traceback.format_exc())
\ No newline at end of file
+    info("❌ 严重错误: " + str(e))
+    info(traceback.format_exc())
+finally:
+    PostMessage("backend:info", "\n".join(info_lines))
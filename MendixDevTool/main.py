@@ -3,6 +3,21 @@ import json
 import traceback
 from typing import Any, Dict, Callable, Iterable
 from abc import ABC, abstractmethod
+try:
+    # orjson encodes/decodes in C; messages are plain dict/list/str payloads.
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+    # UTF-8 bytes for HTTP bodies, without a round trip through str.
+    _dumpb = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    _dumps = json.dumps
+
+    def _dumpb(obj: Any) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+    _loads = json.loads
 
 # Mendix and .NET related imports
 import clr
@@ -10,10 +25,22 @@ clr.AddReference("System.Text.Json")
 clr.AddReference("Mendix.StudioPro.ExtensionsAPI")
 import threading
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
 from dependency_injector import containers, providers
 from System.Text.Json import JsonSerializer
 # ShowDevTools()
 
+# Set to True to include full Python tracebacks in backend:info error logs.
+DEBUG = False
+
+
+def _describe_error(e: Exception) -> str:
+    """Formats an exception for logging; the traceback is only rendered in DEBUG mode."""
+    if DEBUG:
+        return traceback.format_exc()
+    return f"{type(e).__name__}: {e}"
+
 # ===================================================================
 # ===================     FRAMEWORK CODE     ========================
 # ===================================================================
@@ -57,9 +84,17 @@ class IAsyncCommandHandler(ICommandHandler):
 
 class AppController:
     """Routes incoming frontend commands to the appropriate ICommandHandler."""
-    def __init__(self, handlers: Iterable[ICommandHandler], mendix_env: MendixEnvironmentService):
+    def __init__(self, handlers: Iterable[ICommandHandler], mendix_env: MendixEnvironmentService,
+                 max_workers: int = 4):
         self._mendix_env = mendix_env
-        self._command_handlers = {h.command_type: h for h in handlers}
+        handlers = list(handlers)
+        # The handler set is fixed after construction: a read-only view, plus the
+        # async/sync split decided once here instead of an isinstance check per dispatch.
+        self._command_handlers = MappingProxyType({h.command_type: h for h in handlers})
+        self._async_handlers = frozenset(
+            h.command_type for h in handlers if isinstance(h, IAsyncCommandHandler))
+        # Async handlers run on a bounded pool of reused threads instead of one new thread per command.
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cmd")
         self._mendix_env.post_message(
             "backend:info", f"Controller initialized with handlers for: {list(self._command_handlers.keys())}")
 
@@ -73,17 +108,13 @@ class AppController:
                 raise ValueError(f"No handler found for command type: {command_type}")
 
             # Generic logic to handle sync vs. async handlers
-            if isinstance(handler, IAsyncCommandHandler):
+            if command_type in self._async_handlers:
                 task_id = f"task-{uuid.uuid4()}"
-                thread = threading.Thread(
-                    target=handler.execute_async,
-                    args=(payload, task_id)
-                )
-                thread.daemon = True
-                thread.start()
-                # The immediate response includes the taskId for frontend tracking
+                # The immediate acknowledgement is built first, so a rejected command
+                # never leaves a background task running. It includes the taskId for frontend tracking.
                 result = handler.execute(payload)
                 result['taskId'] = task_id
+                self._executor.submit(handler.execute_async, payload, task_id)
                 return self._create_success_response(result, correlation_id)
             else:
                 # Original synchronous execution path
@@ -93,9 +124,13 @@ class AppController:
         except Exception as e:
             error_message = f"Error executing command '{command_type}': {e}"
             self._mendix_env.post_message(
-                "backend:info", f"{error_message}\n{traceback.format_exc()}")
+                "backend:info", f"{error_message}\n{_describe_error(e)}")
             return self._create_error_response(error_message, correlation_id)
 
+    def close(self):
+        """Stops accepting async commands; already running ones are left to finish. Called on reload."""
+        self._executor.shutdown(wait=False)
+
     def _create_success_response(self, data: Any, correlation_id: str) -> Dict:
         return {"status": "success", "data": data, "correlationId": correlation_id}
 
@@ -114,44 +149,70 @@ class AppController:
 # or IAsyncCommandHandler, and register it in the Container below.
 # -------------------------------------------------------------------
 # [REPLACED] Imports & Bridge Service
+import asyncio
 import time
-import uvicorn
-from starlette.applications import Starlette
-from starlette.routing import Route
-from starlette.responses import JSONResponse, Response
-from starlette.requests import Request
+import importlib.util
 from typing import Optional
+# uvicorn/starlette are imported inside BridgeServerService.start, so plugin load does not
+# pay for them unless the bridge server is actually started.
+
+
+def _uvicorn_implementations():
+    """
+    Picks uvloop/httptools (event loop and HTTP parsing in C) when installed. uvloop has
+    no Windows build, so each one falls back to uvicorn's pure-Python default.
+    """
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    return loop, http
 
 # ==========================================
 # [HELPER] Mendix Document/Widget Finder
 # ==========================================
 class MendixFinder:
     @staticmethod
-    def execute_open_logic(payload: Dict, app_root) -> bool:
+    def index_modules(app_root) -> Dict[str, Any]:
+        """Module name -> module, built once per batched request and dropped with it."""
+        return {m.Name: m for m in app_root.GetModules()}
+
+    @staticmethod
+    def find_module(app_root, module_name: str, modules: Optional[Dict[str, Any]] = None):
+        """Looks a module up by name, in `modules` when the caller indexed them already."""
+        if modules is not None:
+            return modules.get(module_name)
+        return next((m for m in app_root.GetModules() if m.Name == module_name), None)
+
+    @staticmethod
+    def find_document(module, unit_name: str):
+        """Depth-first search of a module's folder tree; documents of a folder before its subfolders."""
+        stack = [module]
+        while stack:
+            folder = stack.pop()
+            for d in folder.GetDocuments():
+                if d.Name == unit_name: return d
+            subfolders = list(folder.GetFolders())
+            subfolders.reverse()
+            stack.extend(subfolders)
+        return None
+
+    @staticmethod
+    def execute_open_logic(payload: Dict, app_root, modules: Optional[Dict[str, Any]] = None) -> bool:
         target_str = payload.get('target', '') 
         if not target_str: return False
 
-        parts = target_str.split('.')
-        if len(parts) < 2: return False
-
-        module_name = parts[0]
-        unit_name = parts[1]
-        widget_name = parts[2] if len(parts) > 2 else None
+        # Module.Document[.Widget]: partition avoids building a list of segments.
+        module_name, sep, rest = target_str.partition('.')
+        if not sep: return False
+        unit_name, _, widget_rest = rest.partition('.')
+        if not unit_name: return False
+        widget_name = widget_rest.partition('.')[0] or None
 
         # 1. Find Module
-        module = next((m for m in app_root.GetModules() if m.Name == module_name), None)
+        module = MendixFinder.find_module(app_root, module_name, modules)
         if not module: return False
 
-        # 2. Find Document (Recursive)
-        def find_doc(folder, name):
-            doc = next((d for d in folder.GetDocuments() if d.Name == name), None)
-            if doc: return doc
-            for sub in folder.GetFolders():
-                res = find_doc(sub, name)
-                if res: return res
-            return None
-        
-        document = find_doc(module, unit_name)
+        # 2. Find Document (iterative walk over the folder tree)
+        document = MendixFinder.find_document(module, unit_name)
         if not document: return document
 
         # 3. Find Widget (Recursive)
@@ -178,18 +239,35 @@ class MendixFinder:
         #     if found: target_element = found
         
         # 4. Open Editor
-        if 'dockingWindowService' in globals():
-            dockingWindowService.TryOpenEditor(document, target_element)
+        docking_window_service = globals().get('dockingWindowService')
+        if docking_window_service is not None:
+            docking_window_service.TryOpenEditor(document, target_element)
             return True
         return False
 
+# CORS headers shared by every bridge response. The preflight reply never varies, so
+# start() builds a single Response instance returned for every OPTIONS request.
+_CORS_HEADERS = {
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Methods": "POST, OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type"
+}
+# Upper bound on targets accepted in one batched open_in_studio_pro request.
+MAX_BATCH = 256
+
 class BridgeServerService:
     """Manages the Uvicorn server for Browser-StudioPro communication."""
 
     def __init__(self, mendix_env: MendixEnvironmentService):
         self._mendix_env = mendix_env
-        self._server: Optional[uvicorn.Server] = None
+        self._server: "Optional[uvicorn.Server]" = None
         self._server_thread: Optional[threading.Thread] = None
+        # Set once the Uvicorn server thread has actually returned (port released).
+        self._stopped = threading.Event()
+        self._stopped.set()
+        # Model lookups run here, off the event loop. One worker: the Mendix API is not thread-safe.
+        # Created per server start and shut down when the server thread exits.
+        self._model_executor: Optional[ThreadPoolExecutor] = None
         self.port = 5000 # Matches UserScript default
 
     def is_running(self) -> bool:
@@ -198,49 +276,127 @@ class BridgeServerService:
     def start(self):
         if self.is_running(): return
 
+        import uvicorn
+        from starlette.applications import Starlette
+        from starlette.routing import Route
+        from starlette.responses import JSONResponse, Response
+        from starlette.requests import Request
+
+        class FastJSONResponse(JSONResponse):
+            """JSONResponse rendered with the module's _dumpb (orjson when installed)."""
+            def render(self, content: Any) -> bytes:
+                return _dumpb(content)
+
+        headers = _CORS_HEADERS
+        preflight_response = Response(status_code=204, headers=headers)
+        # The single-target replies are fixed, so their bodies are rendered once per server start.
+        def fixed_json(content: Dict) -> Response:
+            return Response(_dumpb(content), media_type="application/json", headers=headers)
+        success_response = fixed_json({"status": "success"})
+        failed_response = fixed_json({"status": "failed"})
+        shutting_down_response = fixed_json({"status": "shutting_down"})
+
+        def open_batch(items: list, app_root) -> list:
+            # The model can change between requests, so the module index lives only as long as the batch.
+            modules = MendixFinder.index_modules(app_root)
+            results = []
+            for i, item in enumerate(items):
+                try:
+                    success = isinstance(item, dict) and MendixFinder.execute_open_logic(item, app_root, modules)
+                    results.append({"id": i, "status": "success" if success else "failed"})
+                except Exception as e:
+                    results.append({"id": i, "status": "error", "message": str(e)})
+            return results
+
         async def handle_rpc(request: Request):
-            headers = {
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Methods": "POST, OPTIONS",
-                "Access-Control-Allow-Headers": "Content-Type"
-            }
             if request.method == "OPTIONS":
-                return Response(status_code=204, headers=headers)
+                return preflight_response
             
             try:
                 payload = await request.json()
-                
+
+                # 批量请求: 一个 POST 携带多个目标，逐个打开并按序返回结果
+                if isinstance(payload, list):
+                    if len(payload) > MAX_BATCH:
+                        return FastJSONResponse({"status": "error", "message": f"Batch exceeds {MAX_BATCH} targets"},
+                                                status_code=413, headers=headers)
+                    results = await asyncio.get_running_loop().run_in_executor(
+                        self._model_executor, open_batch, payload, self._mendix_env.app.Root)
+                    return FastJSONResponse(results, status_code=200, headers=headers)
+
                 # [新增] 退出指令处理
                 if payload.get("action") == "shutdown":
                     if self._server:
-                        self._server.should_exit = True
-                    return JSONResponse({"status": "shutting_down"}, status_code=200, headers=headers)
+                        self._request_exit()
+                    return shutting_down_response
 
-                success = MendixFinder.execute_open_logic(payload, self._mendix_env.app.Root)
-                return JSONResponse({"status": "success" if success else "failed"}, status_code=200, headers=headers)
+                # The model walk must not block the event loop (preflights, other requests).
+                success = await asyncio.get_running_loop().run_in_executor(
+                    self._model_executor, MendixFinder.execute_open_logic, payload, self._mendix_env.app.Root)
+                return success_response if success else failed_response
             except Exception as e:
-                return JSONResponse({"status": "error", "message": str(e)}, status_code=500, headers=headers)
+                return FastJSONResponse({"status": "error", "message": str(e)}, status_code=500, headers=headers)
 
         app = Starlette(routes=[
             Route("/open_in_studio_pro", handle_rpc, methods=["POST", "OPTIONS"])
         ])
         
-        config = uvicorn.Config(app, host="127.0.0.1", port=self.port, log_config=None)
+        loop_impl, http_impl = _uvicorn_implementations()
+        config = uvicorn.Config(
+            app, host="127.0.0.1", port=self.port, log_config=None,
+            loop=loop_impl, http=http_impl,
+            access_log=False, lifespan="off", interface="asgi3")
         self._server = uvicorn.Server(config)
-        self._server_thread = threading.Thread(target=self._server.run)
+        self._model_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mendix")
+        # A fresh event per start, so a previous run thread finishing late cannot mark this one stopped.
+        self._stopped = threading.Event()
+
+        def _run(server=self._server, model_executor=self._model_executor, stopped=self._stopped):
+            try:
+                server.run()
+            finally:
+                # Also reached when a reloaded script shuts this instance down over HTTP.
+                model_executor.shutdown(wait=False)
+                stopped.set()
+
+        self._server_thread = threading.Thread(target=_run)
         self._server_thread.start()
         
         self._mendix_env.post_message("backend:info", f"Bridge Server started on port {self.port}")
 
+    # Seconds graceful shutdown may take before open connections are dropped.
+    FORCE_EXIT_GRACE = 0.5
+
+    def _request_exit(self):
+        """Asks Uvicorn to stop, escalating to force_exit if it is still up after the grace period."""
+        server, stopped = self._server, self._stopped
+        server.should_exit = True
+
+        def force():
+            if not stopped.is_set():
+                server.force_exit = True
+
+        timer = threading.Timer(self.FORCE_EXIT_GRACE, force)
+        timer.daemon = True
+        timer.start()
+
     def stop(self):
         if not self.is_running(): return
-        self._server.should_exit = True
+        self._request_exit()
         self._mendix_env.post_message("backend:info", "Bridge Server stopped manually.")
 
+    def wait_stopped(self, timeout: float) -> bool:
+        """Blocks until the server thread has exited or `timeout` seconds pass."""
+        return self._stopped.wait(timeout)
+
     def get_status(self) -> Dict:
         return {"status": "running" if self.is_running() else "stopped", "port": self.port}
     
 # [REPLACED] Command Handlers
+# Immediate acknowledgement for the async server commands. AppController adds a taskId
+# to the returned dict, so handlers hand out a shallow copy and never the template itself.
+_ACCEPTED_TEMPLATE = {"status": "accepted"}
+
 class StartServerCommandHandler(IAsyncCommandHandler):
     command_type = "SERVER_START" # Modified type
     def __init__(self, service: BridgeServerService, mendix_env: MendixEnvironmentService):
@@ -248,12 +404,12 @@ class StartServerCommandHandler(IAsyncCommandHandler):
         self._mendix_env = mendix_env
 
     def execute(self, payload: Dict) -> Dict:
-        return {"status": "accepted"}
+        return _ACCEPTED_TEMPLATE.copy()
 
     def execute_async(self, payload: Dict, task_id: str):
         try:
             self._service.start()
-            self._mendix_env.post_message("backend:response", json.dumps({
+            self._mendix_env.post_message("backend:response", _dumps({
                 "taskId": task_id, "status": "success", "data": self._service.get_status()
             }))
         except Exception as e:
@@ -266,12 +422,12 @@ class StopServerCommandHandler(IAsyncCommandHandler):
         self._mendix_env = mendix_env
 
     def execute(self, payload: Dict) -> Dict:
-        return {"status": "accepted"}
+        return _ACCEPTED_TEMPLATE.copy()
 
     def execute_async(self, payload: Dict, task_id: str):
         self._service.stop()
-        time.sleep(0.5)
-        self._mendix_env.post_message("backend:response", json.dumps({
+        self._service.wait_stopped(timeout=3.0)
+        self._mendix_env.post_message("backend:response", _dumps({
             "taskId": task_id, "status": "success", "data": self._service.get_status()
         }))
 
@@ -317,26 +473,32 @@ class Container(containers.DeclarativeContainer):
     )
 
 # --- Application Entrypoint and Wiring ---
+def _read_request(data: Any) -> Any:
+    """Converts the .NET JSON node Studio Pro passes as e.Data: serialized once in C#, parsed once."""
+    return _loads(JsonSerializer.Serialize(data))
+
 def onMessage(e: Any):
     """Entry point called by Mendix Studio Pro for messages from the UI."""
+    global _controller
     if e.Message != "frontend:message":
         return
-    controller = container.app_controller()
+    if _controller is None:
+        _controller = container.app_controller()
+    controller = _controller
     request_object = None
     try:
-        request_string = JsonSerializer.Serialize(e.Data)
-        request_object = json.loads(request_string)
+        request_object = _read_request(e.Data)
         response = controller.dispatch(request_object)
-        PostMessage("backend:response", json.dumps(response))
+        PostMessage("backend:response", _dumps(response))
     except Exception as ex:
-        PostMessage("backend:info", f"Fatal error in onMessage: {ex}\n{traceback.format_exc()}")
+        PostMessage("backend:info", f"Fatal error in onMessage: {ex}\n{_describe_error(ex)}")
         correlation_id = request_object.get("correlationId", "unknown") if request_object else "unknown"
         fatal_error_response = {
             "status": "error",
             "message": f"A fatal backend error occurred: {ex}",
             "correlationId": correlation_id
         }
-        PostMessage("backend:response", json.dumps(fatal_error_response))
+        PostMessage("backend:response", _dumps(fatal_error_response))
 
 def initialize_app():
     """Initializes the IoC container with the Mendix environment services."""
@@ -349,8 +511,29 @@ def initialize_app():
     return container
 
 # --- Application Start ---
-import urllib.request
-import urllib.error
+import socket
+import sys
+
+def wait_port_free(port: int, timeout: float = 3.0) -> bool:
+    """Polls until 127.0.0.1:port can be bound again, with a short backoff, up to `timeout` seconds."""
+    deadline = time.monotonic() + timeout
+    delay = 0.01
+    while True:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+            if sys.platform != "win32":
+                # Same as uvicorn's listener (asyncio sets it on POSIX only), so a port left
+                # in TIME_WAIT counts as free. On Windows the flag would allow binding
+                # over a live listener.
+                probe.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            try:
+                probe.bind(("127.0.0.1", port))
+                return True
+            except OSError:
+                pass
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(delay)
+        delay = min(delay * 2, 0.2)
 
 def ensure_previous_instance_killed(port=5000):
     """
@@ -358,6 +541,15 @@ def ensure_previous_instance_killed(port=5000):
     如果端口通畅（旧服务在运行），旧服务收到指令后会退出。
     如果连接被拒绝（无服务运行），则跳过。
     """
+    # 先做一次廉价的 TCP 探测：端口无人监听 (常见情况) 时直接返回，不加载 urllib 也不发 HTTP 请求
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+        probe.settimeout(0.2)
+        if probe.connect_ex(("127.0.0.1", port)) != 0:
+            return
+
+    import urllib.request
+    import urllib.error
+
     url = f"http://127.0.0.1:{port}/open_in_studio_pro"
     shutdown_payload = json.dumps({"action": "shutdown"}).encode('utf-8')
     
@@ -367,22 +559,36 @@ def ensure_previous_instance_killed(port=5000):
         with urllib.request.urlopen(req, timeout=1) as response:
             PostMessage("backend:info", f"Signal sent to existing instance on port {port}. Waiting for shutdown...")
         
-        # 给予旧线程一点时间释放端口
-        time.sleep(1.5)
+        # 等待旧线程释放端口 (最多 3 秒)
+        wait_port_free(port)
     except urllib.error.URLError:
         # 连接失败说明没有服务在运行，直接继续
         pass
     except Exception as e:
         PostMessage("backend:info", f"Warning during cleanup check: {str(e)}")
 
+def close_previous_controller():
+    """
+    Shuts down the command pool of the controller from the previous run of this script.
+    Studio Pro re-executes main.py on reload, and the old `_controller` global is still
+    visible here when the host keeps the script's globals. A run that never received a
+    message left it as None, and nothing is built just to be closed.
+    """
+    previous = globals().get('_controller')
+    if previous is not None:
+        previous.close()
+
 # 1. 先清理环境
 PostMessage("backend:clear", '')
 
 # 2. 尝试关闭之前的实例（如果有）
+close_previous_controller()
 ensure_previous_instance_killed(5000)
 
 # 3. 初始化并启动新应用
 container = initialize_app()
+# Built by onMessage on the first message; closed by the next run's close_previous_controller.
+_controller: Optional[AppController] = None
 PostMessage("backend:info", "Backend Python script initialized successfully.")
 
 # endregion
\ No newline at end of file
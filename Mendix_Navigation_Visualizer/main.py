@@ -1,7 +1,8 @@
 import json
-from typing import Any, Dict, List, Type, Set
+import sys
+from typing import Any, Dict, List, Type, Set, Sequence
 import traceback
-from collections import deque
+from array import array
 PostMessage("backend:clear",'')
 # ShowDevTools()
 # --- 1. LIBRARY IMPORTS ---
@@ -22,9 +23,86 @@ def serialize_json_object(json_object: Any) -> str:
 def deserialize_json_string(json_string: str) -> Any:
     return json.loads(json_string)
 
+try:
+    import orjson
+
+    def fast_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    fast_dumps = json.dumps
+
 def post_message(channel: str, message: str):
     PostMessage(channel, message)
 
+def build_csr(node_count: int, sources: Sequence[int], targets: Sequence[int]):
+    """Packs an edge list into CSR arrays (indptr, indices), keeping edge order per source."""
+    indptr = array('i', bytes(4 * (node_count + 1)))
+    for s in sources:
+        indptr[s + 1] += 1
+    for i in range(node_count):
+        indptr[i + 1] += indptr[i]
+    fill = array('i', indptr[:-1])
+    indices = array('i', bytes(4 * len(sources)))
+    for s, t in zip(sources, targets):
+        indices[fill[s]] = t
+        fill[s] += 1
+    return indptr, indices
+
+# --- Traversal kernels over CSR arrays (array('i') / bytearray buffers) ---
+# Seeds labelled per multi-source pass: one bit each in an int label
+LABEL_WIDTH = 64
+
+def bfs_reach_labels(indptr, indices, starts, labels, queue, queued) -> None:
+    """Multi-source BFS: bit i of labels[v] ends up set iff v is reachable from starts[i].
+
+    A node is re-queued whenever it gains new bits, but never sits in the queue twice,
+    so `queue` is used as a ring buffer of node_count slots.
+    """
+    n = len(queue)
+    head, count = 0, 0
+    for i in range(len(starts)):
+        s = starts[i]
+        labels[s] |= 1 << i
+        if not queued[s]:
+            queued[s] = 1
+            queue[(head + count) % n] = s
+            count += 1
+    while count:
+        u = queue[head]
+        head = (head + 1) % n
+        count -= 1
+        queued[u] = 0
+        label = labels[u]
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            if labels[v] & label != label:
+                labels[v] |= label
+                if not queued[v]:
+                    queued[v] = 1
+                    queue[(head + count) % n] = v
+                    count += 1
+
+def bfs_shortest_path(indptr, indices, src, dst, parents, queue) -> bool:
+    """Fills `parents` (initialised to -1) with BFS parent pointers from `src`; True once `dst` is reached."""
+    parents[src] = src
+    queue[0] = src
+    head, tail = 0, 1
+    while head < tail:
+        u = queue[head]
+        head += 1
+        if u == dst:
+            return True
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            if parents[v] < 0:
+                parents[v] = u
+                queue[tail] = v
+                tail += 1
+    return False
+
+def _int_buffer(size: int, fill: int = 0) -> array:
+    return array('i', [fill]) * size
+
 # === 2. APPLICATION COMPONENTS (Interfaces and Implementations) ===
 
 #region Abstractions (Interfaces)
@@ -134,8 +212,15 @@ class MendixTraceabilityAnalyzer(ITraceabilityAnalyzer):
         # --- (The existing graph building logic from your code) ---
         nodes_map = {}
         edges_list = []
-        page_lookup = {p.QualifiedName: p for m in self._root.GetUnitsOfType('Projects$Module') for p in m.GetUnitsOfType('Pages$Page')}
-        microflow_lookup = {mf.QualifiedName: mf for m in self._root.GetUnitsOfType('Projects$Module') for mf in m.GetUnitsOfType('Microflows$Microflow')}
+        # One walk over the modules fills both lookups. Qualified names are interned
+        # wherever they enter the build, so every dict and set below shares one string
+        # object (and its cached hash) per node.
+        page_lookup, microflow_lookup = {}, {}
+        for m in self._root.GetUnitsOfType('Projects$Module'):
+            for p in m.GetUnitsOfType('Pages$Page'):
+                page_lookup[sys.intern(p.QualifiedName)] = p
+            for mf in m.GetUnitsOfType('Microflows$Microflow'):
+                microflow_lookup[sys.intern(mf.QualifiedName)] = mf
         
         # Helper functions adapted to be local
         def _get_or_create_node(q_name, type_override=None, name=None):
@@ -152,27 +237,32 @@ class MendixTraceabilityAnalyzer(ITraceabilityAnalyzer):
             if source and target: edges_list.append({"source": source, "target": target, "type": type})
 
         def _get_property_value(el, prop):
+            if el is None:
+                return None
             p = el.GetProperty(prop)
-            return p.Value if p and p.Value else None
+            # .Value crosses into the CLR, so it is read once
+            value = p.Value if p else None
+            return value or None
 
         def _get_references_from_unit(unit, is_page):
             # ... (Same as your _get_references_from_unit)
-            refs = []
+            # Keyed by the referenced qualified name, so dedup hashes plain strings
+            refs = {}
             if is_page:
                 for source in unit.GetElementsOfType('Pages$MicroflowSource'):
                     microflowSettings = _get_property_value(source, 'microflowSettings')
                     if microflowSettings:
                         microflow = _get_property_value(microflowSettings, 'microflow')
-                        refs.append((microflow, "CALLS"))
+                        if microflow: refs.setdefault(microflow, "CALLS")
             else: # Is Microflow
                 for call in unit.GetElementsOfType('Microflows$MicroflowCall'):
-                    if mf := _get_property_value(call, 'microflow'): refs.append((mf, "CALLS"))
+                    if mf := _get_property_value(call, 'microflow'): refs.setdefault(mf, "CALLS")
                 for act in unit.GetElementsOfType('Microflows$ActionActivity'):
                     action = _get_property_value(act, 'action')
                     if action and action.Type == 'Microflows$ShowPageAction':
                         if page := _get_property_value(_get_property_value(action, 'pageSettings'), 'page'):
-                            refs.append((page, "SHOWS"))
-            return list(set(refs))
+                            refs.setdefault(page, "SHOWS")
+            return list(refs.items())
             
         # --- (The rest of the graph traversal logic) ---
         queue = []
@@ -184,7 +274,8 @@ class MendixTraceabilityAnalyzer(ITraceabilityAnalyzer):
                 homePage = _get_property_value(profile, 'homePage')
                 home_page_name = _get_property_value(homePage, 'page')
                 if home_page_name:
-                    nav_id = f"Navigation.{profile.Name}"
+                    home_page_name = sys.intern(home_page_name)
+                    nav_id = sys.intern(f"Navigation.{profile.Name}")
                     _get_or_create_node(nav_id, "NAVIGATION_ITEM", name=f"Home Page ({profile.Name})")
                     _get_or_create_node(home_page_name, "PAGE")
                     _add_edge(nav_id, home_page_name, "SHOWS")
@@ -196,11 +287,15 @@ class MendixTraceabilityAnalyzer(ITraceabilityAnalyzer):
         head = 0
         while head < len(queue):
             current_id = queue[head]; head += 1
-            unit = page_lookup.get(current_id) or microflow_lookup.get(current_id)
-            if not unit: continue
-            references = _get_references_from_unit(unit, current_id in page_lookup)
+            unit = page_lookup.get(current_id)
+            is_page = unit is not None
+            if not is_page:
+                unit = microflow_lookup.get(current_id)
+                if unit is None: continue
+            references = _get_references_from_unit(unit, is_page)
             for ref_id, edge_type in references:
                 if ref_id:
+                    ref_id = sys.intern(ref_id)
                     _get_or_create_node(ref_id)
                     _add_edge(current_id, ref_id, edge_type)
                     if ref_id not in processed_items:
@@ -213,12 +308,16 @@ class MendixTraceabilityAnalyzer(ITraceabilityAnalyzer):
             "edges": edges_list
         }
         self._nodes_by_id = {node['id']: node for node in self._full_graph_cache['nodes']}
-        # Adjacency lists for fast traversal
-        self._adj = {node['id']: [] for node in self._full_graph_cache['nodes']}
-        self._rev_adj = {node['id']: [] for node in self._full_graph_cache['nodes']}
-        for edge in edges_list:
-            if edge['source'] in self._adj: self._adj[edge['source']].append(edge['target'])
-            if edge['target'] in self._rev_adj: self._rev_adj[edge['target']].append(edge['source'])
+        # CSR adjacency (forward and reverse) over dense node indices for fast traversal
+        self._idx_to_id = list(nodes_map)
+        self._id_to_idx = {node_id: i for i, node_id in enumerate(self._idx_to_id)}
+        sources = [self._id_to_idx[edge['source']] for edge in edges_list]
+        targets = [self._id_to_idx[edge['target']] for edge in edges_list]
+        node_count = len(self._idx_to_id)
+        self._fwd_indptr, self._fwd_indices = build_csr(node_count, sources, targets)
+        # Position of each forward CSR slot in the edge list, for subgraph extraction
+        self._fwd_edge_ids = build_csr(node_count, sources, range(len(sources)))[1]
+        self._rev_indptr, self._rev_indices = build_csr(node_count, targets, sources)
 
     # --- Public API Methods ---
     def get_full_graph(self) -> Dict[str, Any]:
@@ -228,74 +327,71 @@ class MendixTraceabilityAnalyzer(ITraceabilityAnalyzer):
     def find_paths(self, start_node_id: str, end_node_id: str) -> List[List[Dict[str, Any]]]:
         self._build_graph_if_needed()
         # Using BFS to find the shortest path for simplicity
-        if start_node_id not in self._adj or end_node_id not in self._adj:
+        start, end = self._id_to_idx.get(start_node_id), self._id_to_idx.get(end_node_id)
+        if start is None or end is None:
             return []
-        queue = deque([(start_node_id, [start_node_id])])
-        visited = {start_node_id}
-        
-        while queue:
-            current_node, path = queue.popleft()
-            if current_node == end_node_id:
-                return [[self._nodes_by_id.get(node_id) for node_id in path if self._nodes_by_id.get(node_id)]]
-
-            for neighbor in self._adj.get(current_node, []):
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    new_path = list(path)
-                    new_path.append(neighbor)
-                    queue.append((neighbor, new_path))
-        return [] # No path found
-
-    def _traverse(self, start_nodes: List[str], forward: bool = True) -> Set[str]:
-        adj_list = self._adj if forward else self._rev_adj
-        all_related = set()
-        for start_node in start_nodes:
-            q = deque([start_node])
-            visited = {start_node}
-            while q:
-                curr = q.popleft()
-                for neighbor in adj_list.get(curr, []):
-                    if neighbor not in visited:
-                        visited.add(neighbor)
-                        q.append(neighbor)
-            all_related.update(visited)
-        return all_related
+        node_count = len(self._idx_to_id)
+        parents = _int_buffer(node_count, -1)
+        if not bfs_shortest_path(self._fwd_indptr, self._fwd_indices, start, end, parents, _int_buffer(node_count)):
+            return [] # No path found
+        # Rebuild the path from the parent pointers only at the API boundary
+        path = [end]
+        while path[-1] != start:
+            path.append(parents[path[-1]])
+        path.reverse()
+        return [[self._nodes_by_id[self._idx_to_id[i]] for i in path]]
+
+    def _common_reachable(self, node_ids: List[str], forward: bool) -> Set[int]:
+        """Indices of the nodes reachable from every seed, found by labelled multi-source BFS."""
+        if any(node_id not in self._id_to_idx for node_id in node_ids):
+            # An unknown node reaches nothing but itself, so nothing is shared.
+            return set()
+        if forward:
+            indptr, indices = self._fwd_indptr, self._fwd_indices
+        else:
+            indptr, indices = self._rev_indptr, self._rev_indices
+        node_count = len(self._idx_to_id)
+        seeds = sorted({self._id_to_idx[node_id] for node_id in node_ids})
+        common = None
+        # One pass per LABEL_WIDTH seeds; a node is common if every pass labels it fully
+        for offset in range(0, len(seeds), LABEL_WIDTH):
+            batch = seeds[offset:offset + LABEL_WIDTH]
+            labels = [0] * node_count
+            bfs_reach_labels(indptr, indices, batch, labels, _int_buffer(node_count), bytearray(node_count))
+            full = (1 << len(batch)) - 1
+            reached_by_all = {i for i, label in enumerate(labels) if label == full}
+            common = reached_by_all if common is None else common & reached_by_all
+            if not common:
+                break
+        # We should not include the selected nodes themselves in the result
+        return common.difference(seeds)
 
     def find_common_upstream(self, node_ids: List[str]) -> Dict[str, Any]:
         self._build_graph_if_needed()
         if not node_ids: return {"nodes": [], "edges": []}
-        
-        ancestor_sets = []
-        for node_id in node_ids:
-            ancestors = self._traverse([node_id], forward=False)
-            ancestor_sets.append(ancestors)
-            
-        common_ancestors_ids = set.intersection(*ancestor_sets)
-        # We should not include the selected nodes themselves in the result
-        common_ancestors_ids = common_ancestors_ids - set(node_ids)
-
-        return self.get_subgraph(list(common_ancestors_ids))
+        return self._subgraph(self._common_reachable(node_ids, forward=False))
 
     def find_common_downstream(self, node_ids: List[str]) -> Dict[str, Any]:
         self._build_graph_if_needed()
         if not node_ids: return {"nodes": [], "edges": []}
-        
-        descendant_sets = []
-        for node_id in node_ids:
-            descendants = self._traverse([node_id], forward=True)
-            descendant_sets.append(descendants)
-            
-        common_descendants_ids = set.intersection(*descendant_sets)
-        common_descendants_ids = common_descendants_ids - set(node_ids)
-
-        return self.get_subgraph(list(common_descendants_ids))
+        return self._subgraph(self._common_reachable(node_ids, forward=True))
 
     def get_subgraph(self, node_ids: List[str]) -> Dict[str, Any]:
         self._build_graph_if_needed()
-        node_id_set = set(node_ids)
-        subgraph_nodes = [node for node in self._full_graph_cache['nodes'] if node['id'] in node_id_set]
-        subgraph_edges = [edge for edge in self._full_graph_cache['edges'] if edge['source'] in node_id_set and edge['target'] in node_id_set]
-        return {"nodes": subgraph_nodes, "edges": subgraph_edges}
+        return self._subgraph({self._id_to_idx[node_id] for node_id in node_ids if node_id in self._id_to_idx})
+
+    def _subgraph(self, members) -> Dict[str, Any]:
+        """Builds the induced subgraph from node indices, walking only their CSR rows.
+
+        Work is proportional to the selection and its out-edges, never to the whole graph.
+        """
+        members = set(members)
+        nodes, edges = self._full_graph_cache['nodes'], self._full_graph_cache['edges']
+        indptr, indices, edge_ids = self._fwd_indptr, self._fwd_indices, self._fwd_edge_ids
+        edge_positions = [edge_ids[k] for u in members for k in range(indptr[u], indptr[u + 1]) if indices[k] in members]
+        edge_positions.sort()
+        # Both lists keep the order of the full graph
+        return {"nodes": [nodes[i] for i in sorted(members)], "edges": [edges[k] for k in edge_positions]}
 #endregion
 
 #region rpc
@@ -315,8 +411,6 @@ class RpcHandler:
         return self._editor.locate_element(qualifiedName, elementType)
 
     # --- [NEW] RPC Method Implementation ---
-    def get_traceability_graph(self) -> Dict[str, Any]:
-        return self._analyzer.analyze()
     def get_traceability_graph(self) -> Dict[str, Any]:
         # This now just serves to get the full graph initially
         return self._analyzer.get_full_graph()
@@ -400,8 +494,8 @@ for name, method in rpc_methods.items():
 
 def onMessage(e):
     if e.Message == "frontend:message":
-        message_data = deserialize_json_string(serialize_json_object(e))
-        # PostMessage("backend:info", serialize_json_object(e))
-        response = dispatcher_instance.handle_request(message_data["Data"])
-        post_message("backend:response", json.dumps(response))
+        # Only the payload is marshalled out of .NET; the event wrapper is never serialized.
+        request = deserialize_json_string(serialize_json_object(e.Data))
+        response = dispatcher_instance.handle_request(request)
+        post_message("backend:response", fast_dumps(response))
 #endregion
\ No newline at end of file
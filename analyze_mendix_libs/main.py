@@ -3,7 +3,7 @@ import clr
 from System.Text.Json import JsonSerializer
 import json
 import traceback
-from typing import Any, Dict, Callable
+from typing import Any, Dict, Callable, Optional
 
 # --- Dependency Injection ---
 from dependency_injector import containers, providers
@@ -13,7 +13,19 @@ from dependency_injector.wiring import inject, Provide
 import os
 import re
 from collections import defaultdict
-import pandas as pd
+try:
+    import ijson  # streams SBOM components instead of loading the whole document
+    _SBOM_PARSE_ERRORS = (json.JSONDecodeError, ijson.JSONError)
+except ImportError:
+    ijson = None
+    _SBOM_PARSE_ERRORS = (json.JSONDecodeError,)
+try:
+    import orjson  # faster encoding of the analysis responses
+
+    def fast_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    fast_dumps = json.dumps
 
 # pythonnet library setup for embedding C#
 clr.AddReference("System.Text.Json")
@@ -32,28 +44,48 @@ ShowDevTools()
 # 1. JAR CONFLICT ANALYSIS LOGIC (UPDATED)
 # ===================================================================
 
-def parse_userlib_dir(directory_path: str) -> list:
-    """Analyzes a Mendix userlib directory to parse JARs and identify their sources."""
-    jar_pattern = re.compile(r'^(.*?)-(\d+(?:\.\d+)*.*?)\.jar$')
-    generic_jar_pattern = re.compile(r'^(.*?)_([\d\.]+.*?)\.jar$')
-    required_by_pattern = re.compile(r'^(.*\.jar)\.(.*?)\.(RequiredLib|Required\.by.*)$')
+# "<name>-<version>.jar", falling back to "<name>_<version>.jar"
+_JAR_NAME_RE = re.compile(
+    r'^(?P<name>.*?)-(?P<version>\d+(?:\.\d+)*.*?)\.jar$'
+    r'|^(?P<generic_name>.*?)_(?P<generic_version>[\d\.]+.*?)\.jar$'
+)
+# "<jar>.<module>.RequiredLib" / "<jar>.<module>.Required.by..." markers
+_REQUIRED_BY_RE = re.compile(r'^(.*\.jar)\.(.*?)\.(RequiredLib|Required\.by.*)$')
+# Maven group prefixes folded into the conventional artifact names
+_LIB_NAME_REWRITES = (
+    ('org.apache.commons.', 'commons-'),
+    ('org.apache.httpcomponents.', ''),
+)
+# Columns of the dependency report, in display order
+_REPORT_COLUMNS = ('library_name', 'version', 'source', 'details', 'filename')
+
+def parse_userlib_dir(directory_path: str, filenames: Optional[list] = None) -> list:
+    """Analyzes a Mendix userlib directory to parse JARs and identify their sources.
+
+    `filenames` may carry a listing of the directory the caller already took.
+    """
     jar_info = {}
+    required_markers = []
 
-    try:
-        filenames = os.listdir(directory_path)
-    except FileNotFoundError:
-        return []
+    if filenames is None:
+        try:
+            with os.scandir(directory_path) as entries:
+                filenames = [entry.name for entry in entries]
+        except FileNotFoundError:
+            return []
 
     for filename in filenames:
         if filename.endswith('.jar'):
             lib_name, version = None, None
-            match = jar_pattern.match(filename)
-            if not match:
-                match = generic_jar_pattern.match(filename)
+            match = _JAR_NAME_RE.match(filename)
             if match:
-                lib_name, version = match.groups()
-                lib_name = lib_name.replace('org.apache.commons.', 'commons-')
-                lib_name = lib_name.replace('org.apache.httpcomponents.', '')
+                if match['name'] is not None:
+                    lib_name, version = match['name'], match['version']
+                else:
+                    lib_name, version = match['generic_name'], match['generic_version']
+                for old, new in _LIB_NAME_REWRITES:
+                    if old in lib_name:
+                        lib_name = lib_name.replace(old, new)
             
             jar_info[filename] = {
                 'library_name': lib_name if lib_name else filename.replace('.jar', ''),
@@ -63,14 +95,16 @@ def parse_userlib_dir(directory_path: str) -> list:
                 'filename': filename, 
                 'details': {'filename': filename, 'required_by': set()}
             }
-
-    for filename in filenames:
         if 'Required' in filename:
-            match = required_by_pattern.match(filename)
-            if match:
-                jar_filename, module_name, _ = match.groups()
-                if jar_filename in jar_info:
-                    jar_info[jar_filename]['details']['required_by'].add(module_name)
+            required_markers.append(filename)
+
+    # Markers may be listed before their JAR, so apply them once all JARs are known
+    for filename in required_markers:
+        match = _REQUIRED_BY_RE.match(filename)
+        if match:
+            jar_filename, module_name, _ = match.groups()
+            if jar_filename in jar_info:
+                jar_info[jar_filename]['details']['required_by'].add(module_name)
     
     dependency_list = []
     for info in jar_info.values():
@@ -85,37 +119,53 @@ def parse_sbom_file(sbom_path: str) -> list:
     """Parses a CycloneDX SBOM JSON file to extract dependency information."""
     dependency_list = []
     try:
-        with open(sbom_path, 'r', encoding='utf-8') as f:
-            sbom_data = json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
+        with open(sbom_path, 'rb') as f:
+            if ijson is not None:
+                components = ijson.items(f, 'components.item', use_float=True)
+            else:
+                components = json.load(f).get('components', [])
+            for comp in components:
+                lib_name = comp.get('name')
+                if lib_name:
+                    dependency_list.append({
+                        'library_name': lib_name,
+                        'version': comp.get('version', 'unknown'),
+                        'source': 'SBOM (vendorlib)',
+                        'filename': None, # SBOM entries have no physical file in userlib
+                        'details': f"PURL: {comp.get('purl', 'N/A')}"
+                    })
+    except FileNotFoundError:
+        return []
+    except _SBOM_PARSE_ERRORS:
+        # A truncated or invalid SBOM yields nothing, even if some components streamed already
         return []
-
-    components = sbom_data.get('components', [])
-    for comp in components:
-        lib_name = comp.get('name')
-        if lib_name:
-            dependency_list.append({
-                'library_name': lib_name,
-                'version': comp.get('version', 'unknown'),
-                'source': 'SBOM (vendorlib)',
-                'filename': None, # SBOM entries have no physical file in userlib
-                'details': f"PURL: {comp.get('purl', 'N/A')}"
-            })
     return dependency_list
 
 def analyze_conflicts(dependencies: list) -> dict:
     """Analyzes a combined list of dependencies to find version conflicts."""
-    grouped_libs = defaultdict(list)
+    # Single pass: a library is flagged as soon as a version differing from its first
+    # one shows up, so no per-library version sets are needed.
+    first_versions = {}
+    deps_by_lib = defaultdict(list)
+    conflicting = set()
     for dep in dependencies:
-        if dep['version'] != 'unknown':
-            grouped_libs[dep['library_name']].append({
-                'version': dep['version'],
-                'source': dep['source'],
-                'filename': dep.get('filename'), # Pass filename through
-                'details': dep['details']
-            })
-
-    conflicts = {lib_name: versions_info for lib_name, versions_info in grouped_libs.items() if len({info['version'] for info in versions_info}) > 1}
+        version = dep['version']
+        if version != 'unknown':
+            lib_name = dep['library_name']
+            if first_versions.setdefault(lib_name, version) != version:
+                conflicting.add(lib_name)
+            deps_by_lib[lib_name].append(dep)
+
+    # Report entries are only built for conflicting libraries, in first-seen order
+    conflicts = {
+        lib_name: [{
+            'version': dep['version'],
+            'source': dep['source'],
+            'filename': dep.get('filename'), # Pass filename through
+            'details': dep['details']
+        } for dep in deps]
+        for lib_name, deps in deps_by_lib.items() if lib_name in conflicting
+    }
     return conflicts
 
 
@@ -133,11 +183,35 @@ class JarConflictService:
     """Handles the business logic for analyzing JARs and managing files."""
     def __init__(self, mendix_env: MendixEnvironmentService):
         self._mendix_env = mendix_env
+        # (signature, result) of the last analysis; see _analysis_signature
+        self._analysis_cache = None
 
     def _get_userlib_path(self):
         project_path = self._mendix_env.app.Root.DirectoryPath
         return os.path.join(project_path, 'userlib')
 
+    @staticmethod
+    def _analysis_signature(userlib_path: str, sbom_path: str) -> tuple:
+        """Returns (signature, userlib filenames).
+
+        The signature changes whenever a userlib entry or the SBOM is added, removed or
+        modified; the filenames are None if userlib does not exist.
+        """
+        filenames = None
+        try:
+            with os.scandir(userlib_path) as entries:
+                listing = [(entry.name, entry.stat().st_mtime_ns) for entry in entries]
+            filenames = [name for name, _ in listing]
+            userlib_state = (os.stat(userlib_path).st_mtime_ns, len(listing),
+                             max((mtime for _, mtime in listing), default=0))
+        except FileNotFoundError:
+            userlib_state = None
+        try:
+            sbom_state = os.stat(sbom_path).st_mtime_ns
+        except FileNotFoundError:
+            sbom_state = None
+        return (userlib_path, sbom_path, userlib_state, sbom_state), filenames
+
     def analyze_project(self, payload: Dict) -> Dict:
         """Runs the full JAR analysis for the current Mendix project."""
         project_path = self._mendix_env.app.Root.DirectoryPath
@@ -149,23 +223,28 @@ class JarConflictService:
         sbom_path_mx9 = os.path.join(project_path, 'vendorlib', 'vendorlib-sbom.json')
         sbom_path = sbom_path_mx10 if os.path.exists(sbom_path_mx10) else sbom_path_mx9
 
-        userlib_deps = parse_userlib_dir(userlib_path)
+        signature, userlib_filenames = self._analysis_signature(userlib_path, sbom_path)
+        if self._analysis_cache and self._analysis_cache[0] == signature:
+            return self._analysis_cache[1]
+
+        # Reuse the listing taken for the signature instead of scanning userlib again
+        userlib_deps = parse_userlib_dir(userlib_path, userlib_filenames)
         sbom_deps = parse_sbom_file(sbom_path)
         all_dependencies = userlib_deps + sbom_deps
 
-        # Create DataFrame for analysis and reporting
-        df = pd.DataFrame(all_dependencies)
-        all_deps_list = []
-        if not df.empty:
-            cols = ['library_name', 'version', 'source', 'details', 'filename']
-            existing_cols = [c for c in cols if c in df.columns]
-            df = df[existing_cols]
-            df = df.sort_values(by=['library_name', 'version']).reset_index(drop=True)
-            all_deps_list = df.to_dict('records')
+        # Stable sort for reporting; a missing (null) SBOM version sorts last.
+        # Rows are projected onto the report columns, in report order.
+        all_deps_list = [
+            {col: dep.get(col) for col in _REPORT_COLUMNS}
+            for dep in sorted(
+                all_dependencies,
+                key=lambda d: (d['library_name'], d['version'] is None, d['version'] or '')
+            )
+        ]
 
         conflict_report = analyze_conflicts(all_dependencies)
 
-        return {
+        result = {
             "dependencies": all_deps_list,
             "conflicts": conflict_report,
             "summary": {
@@ -175,6 +254,8 @@ class JarConflictService:
                 "conflict_count": len(conflict_report)
             }
         }
+        self._analysis_cache = (signature, result)
+        return result
 
     def batch_delete_jars(self, payload: Dict) -> Dict:
         """Handles batch deletion with dry-run planning."""
@@ -211,6 +292,9 @@ class JarConflictService:
                 except Exception as e:
                     results.append({"filename": filename, "status": "error", "reason": str(e)})
 
+        if not dry_run:
+            self._analysis_cache = None
+
         mode_str = "DRY RUN PLAN" if dry_run else "DELETION REPORT"
         self._mendix_env.post_message("backend:info", f"{mode_str}: Processed {len(filenames)} files.")
 
@@ -291,10 +375,11 @@ container.config.from_dict({
     "app_context": currentApp,
     "post_message_func": PostMessage,
 })
+# Resolved once; every frontend message goes through this singleton
+controller = container.app_controller()
 
 def onMessage(e: Any):
     """Entry point for all messages from the frontend."""
-    controller = container.app_controller()
     if e.Message != "frontend:message":
         return
 
@@ -307,7 +392,7 @@ def onMessage(e: Any):
             return
 
         response = controller.dispatch(request_object)
-        PostMessage("backend:response", json.dumps(response))
+        PostMessage("backend:response", fast_dumps(response))
 
     except Exception as ex:
         PostMessage("backend:info", f"Fatal error in onMessage: {ex}\n{traceback.format_exc()}")
@@ -325,4 +410,4 @@ def onMessage(e: Any):
             correlation_id,
             {"traceback": traceback.format_exc()}
         )
-        PostMessage("backend:response", json.dumps(error_response))
\ No newline at end of file
+        PostMessage("backend:response", fast_dumps(error_response))
\ No newline at end of file
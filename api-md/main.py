@@ -189,7 +189,10 @@ import System
 import System.Reflection
 from System.Reflection import BindingFlags
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import os
 import threading
+import time
 import traceback
 
 def safe_get_name(type_obj):
@@ -207,6 +210,21 @@ def safe_get_name(type_obj):
     except:
         return "UnknownType"
 
+# Fixed Markdown fragments of a type section
+_MD_PROPERTIES_OPEN = "**Properties**\n```csharp"
+_MD_METHODS_OPEN = "**Methods**\n```csharp"
+_MD_ENUM_OPEN = "**Enum Members**\n```"
+_MD_FENCE_CLOSE = "```\n"
+_MD_TYPE_SEPARATOR = "\n---\n"
+
+# (canRead, canWrite) -> C# accessor list
+_ACCESSORS = {
+    (True, True): "get; set;",
+    (True, False): "get;",
+    (False, True): "set;",
+    (False, False): "",
+}
+
 def _format_params_str(params: list) -> str:
     """Formats a list of parameter dictionaries into a C#-like string."""
     if not params:
@@ -214,31 +232,47 @@ def _format_params_str(params: list) -> str:
     param_strings = [f"{p['type']} {p['name']}" for p in params]
     return f"({', '.join(param_strings)})"
 
+# Base types that C# signatures leave implicit
+_IMPLICIT_BASE_TYPES = frozenset(("object", "ValueType", "Enum", "N/A"))
+
+def _signature_prefix(kind: str, is_abstract: bool, is_sealed: bool) -> str:
+    parts = ["public"]
+    if is_abstract and kind != "Interface": parts.append("abstract")
+    if is_sealed and kind == "Class": parts.append("sealed")
+    parts.append(kind.lower())
+    return " ".join(parts)
+
+# (typeKind, isAbstract, isSealed) -> signature prefix, precomputed for every combination
+_KIND_PREFIX = {
+    (kind, is_abstract, is_sealed): _signature_prefix(kind, is_abstract, is_sealed)
+    for kind in ("Class", "Interface", "Enum", "Struct")
+    for is_abstract in (False, True)
+    for is_sealed in (False, True)
+}
+
 def _format_signature(t: dict) -> str:
     """Creates a C#-like class/interface/enum signature string."""
-    parts = ["public"]
-    if t["isAbstract"] and t["typeKind"] != "Interface": parts.append("abstract")
-    if t["isSealed"] and t["typeKind"] == "Class": parts.append("sealed")
-    parts.append(t["typeKind"].lower())
-    parts.append(t["name"])
-
-    inheritance = []
-    if t["baseType"] and t["baseType"] not in ["object", "ValueType", "Enum", "N/A"]:
-        inheritance.append(t["baseType"])
-    if t["interfaces"]:
-        inheritance.extend(t["interfaces"])
-    
+    prefix = _KIND_PREFIX[t["typeKind"], t["isAbstract"], t["isSealed"]]
+    interfaces = t["interfaces"] or ()
+    base_type = t["baseType"]
+    if base_type and base_type not in _IMPLICIT_BASE_TYPES:
+        inheritance = [base_type, *interfaces]
+    else:
+        inheritance = interfaces
     if inheritance:
-        parts.append(":")
-        parts.append(", ".join(inheritance))
-    
-    return " ".join(parts)
+        return f"{prefix} {t['name']} : {', '.join(inheritance)}"
+    return f"{prefix} {t['name']}"
 
 # endregion
 
 class DocsGenerateJob(IJobHandler):
     """Reflects the Mendix Extensions API assembly and generates Markdown documentation."""
     command_type = "docs:generate"
+    # Reflection progress: at most this many updates, and at most one per interval (seconds)
+    PROGRESS_UPDATES = 20
+    PROGRESS_INTERVAL = 0.1
+    # Reflection calls into .NET release the GIL, so types are described in parallel
+    MAX_REFLECTION_WORKERS = 8
 
     def run(self, payload: Dict, context: IJobContext) -> str:
         """
@@ -268,34 +302,60 @@ class DocsGenerateJob(IJobHandler):
         if not assembly:
             raise RuntimeError("Could not find assembly: Mendix.StudioPro.ExtensionsAPI")
             
-        all_types = list(assembly.GetTypes())
-        total_types = len(all_types)
+        public_types = [t for t in assembly.GetTypes() if t.IsPublic]
+        total_types = len(public_types)
         flat_type_list = []
         binding_flags = BindingFlags.Instance | BindingFlags.Static | BindingFlags.Public | BindingFlags.DeclaredOnly
 
-        for i, type_info in enumerate(all_types):
-            if i % 25 == 0: # Update progress periodically
-                progress = 2.0 + (i / total_types) * 88.0 # Scale progress from 2% to 90%
-                context.report_progress(ProgressUpdate(percent=progress, message=f"Analyzing type {i+1}/{total_types}...", stage="Reflecting"))
+        # Bind helpers and bound methods once, and read each reflection property
+        # of a type/member only once.
+        _safe = safe_get_name
+        _report = context.report_progress
+        _append = flat_type_list.append
+        _enum_names = System.Enum.GetNames
+
+        def _prop(p):
+            return {"name": p.Name, "type": _safe(p.PropertyType), "canRead": p.CanRead, "canWrite": p.CanWrite}
 
-            if not type_info.IsPublic:
-                continue
+        def _param(p):
+            return {"name": p.Name, "type": _safe(p.ParameterType)}
 
+        def _method(m):
+            return {"name": m.Name, "returnType": _safe(m.ReturnType), "isStatic": m.IsStatic,
+                    "parameters": [_param(p) for p in m.GetParameters()]}
+
+        def _describe(type_info):
+            is_enum = type_info.IsEnum
             type_kind = "Class"
             if type_info.IsInterface: type_kind = "Interface"
-            elif type_info.IsEnum: type_kind = "Enum"
-            elif type_info.IsValueType and not type_info.IsEnum: type_kind = "Struct"
+            elif is_enum: type_kind = "Enum"
+            elif type_info.IsValueType: type_kind = "Struct"
             
-            type_data = {
+            return {
                 "fullName": type_info.FullName, "name": type_info.Name, "namespace": type_info.Namespace,
-                "isPublic": type_info.IsPublic, "isAbstract": type_info.IsAbstract, "isSealed": type_info.IsSealed,
-                "typeKind": type_kind, "baseType": safe_get_name(type_info.BaseType),
-                "interfaces": [safe_get_name(i) for i in type_info.GetInterfaces()],
-                "properties": [{"name": p.Name, "type": safe_get_name(p.PropertyType), "canRead": p.CanRead, "canWrite": p.CanWrite} for p in type_info.GetProperties(binding_flags)],
-                "methods": [{"name": m.Name, "returnType": safe_get_name(m.ReturnType), "isStatic": m.IsStatic, "parameters": [{"name": p.Name, "type": safe_get_name(p.ParameterType)} for p in m.GetParameters()]} for m in type_info.GetMethods(binding_flags) if not m.IsSpecialName],
-                "enumValues": list(System.Enum.GetNames(type_info)) if type_info.IsEnum else None,
+                "isPublic": True, "isAbstract": type_info.IsAbstract, "isSealed": type_info.IsSealed,
+                "typeKind": type_kind, "baseType": _safe(type_info.BaseType),
+                "interfaces": [_safe(t) for t in type_info.GetInterfaces()],
+                "properties": [_prop(p) for p in type_info.GetProperties(binding_flags)],
+                "methods": [_method(m) for m in type_info.GetMethods(binding_flags) if not m.IsSpecialName],
+                "enumValues": list(_enum_names(type_info)) if is_enum else None,
             }
-            flat_type_list.append(type_data)
+
+        # Each update is serialized and posted to the UI, so keep them few
+        report_every = max(1, total_types // self.PROGRESS_UPDATES)
+        last_report = float("-inf")
+
+        workers = min(self.MAX_REFLECTION_WORKERS, os.cpu_count() or 4)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reflect") as executor:
+            # map yields in input order; progress is reported from this thread as results arrive
+            for i, type_data in enumerate(executor.map(_describe, public_types)):
+                _append(type_data)
+                if i % report_every == 0: # Update progress periodically
+                    now = time.monotonic()
+                    if now - last_report >= self.PROGRESS_INTERVAL:
+                        last_report = now
+                        progress = 2.0 + (i / total_types) * 88.0 # Scale progress from 2% to 90%
+                        _report(ProgressUpdate(percent=progress, message=f"Analyzing type {i+1}/{total_types}...", stage="Reflecting"))
 
         context.report_progress(ProgressUpdate(percent=90.0, message="Grouping and sorting results...", stage="Grouping"))
         grouped_namespaces = defaultdict(lambda: defaultdict(list))
@@ -316,35 +376,40 @@ class DocsGenerateJob(IJobHandler):
         """Takes structured API metadata and converts it into a Markdown document."""
         context.report_progress(ProgressUpdate(percent=95.0, message="Generating Markdown document...", stage="Formatting"))
         md = [f"# Mendix Extensions API Reference\n**Assembly:** `{api_data['assemblyName']}`\n\n---\n"]
+        _app = md.append
+        _ext = md.extend
 
         for ns_name, kinds in api_data["namespaces"].items():
-            md.append(f"## Namespace: `{ns_name}`\n")
+            _app(f"## Namespace: `{ns_name}`\n")
             for kind_name, types in sorted(kinds.items()):
-                md.append(f"### {kind_name}s\n")
+                _app(f"### {kind_name}s\n")
                 for type_info in types:
-                    md.append(f"\n#### `{type_info['name']}`\n")
-                    md.append(f"```csharp\n{_format_signature(type_info)}\n```\n")
+                    # Each type is assembled locally and added to the document in one extend
+                    block = [f"\n#### `{type_info['name']}`\n", f"```csharp\n{_format_signature(type_info)}\n```\n"]
                     
                     if type_info.get("properties"):
-                        md.append("**Properties**\n```csharp")
-                        for p in type_info["properties"]:
-                            accessors = " ".join(filter(None, ["get;" if p['canRead'] else None, "set;" if p['canWrite'] else None]))
-                            md.append(f"public {p['type']} {p['name']} {{ {accessors} }}")
-                        md.append("```\n")
+                        block.append(_MD_PROPERTIES_OPEN)
+                        block.extend(
+                            f"public {p['type']} {p['name']} {{ {_ACCESSORS[p['canRead'], p['canWrite']]} }}"
+                            for p in type_info["properties"]
+                        )
+                        block.append(_MD_FENCE_CLOSE)
 
                     if type_info.get("methods"):
-                        md.append("**Methods**\n```csharp")
-                        for m in type_info["methods"]:
-                            static_str = "static " if m['isStatic'] else ""
-                            md.append(f"public {static_str}{m['returnType']} {m['name']}{_format_params_str(m['parameters'])};")
-                        md.append("```\n")
+                        block.append(_MD_METHODS_OPEN)
+                        block.extend(
+                            f"public {'static ' if m['isStatic'] else ''}{m['returnType']} {m['name']}{_format_params_str(m['parameters'])};"
+                            for m in type_info["methods"]
+                        )
+                        block.append(_MD_FENCE_CLOSE)
                     
                     if type_info.get("enumValues"):
-                        md.append("**Enum Members**\n```")
-                        md.extend(type_info["enumValues"])
-                        md.append("```\n")
+                        block.append(_MD_ENUM_OPEN)
+                        block.extend(type_info["enumValues"])
+                        block.append(_MD_FENCE_CLOSE)
                     
-                    md.append("\n---\n")
+                    block.append(_MD_TYPE_SEPARATOR)
+                    _ext(block)
         
         return "\n".join(md)
 
@@ -388,7 +453,7 @@ class Container(containers.DeclarativeContainer):
 def onMessage(e: Any):
     """Entry point called by Mendix Studio Pro for messages from the UI."""
     if e.Message != "frontend:message": return
-    controller = container.app_controller()
+    controller = _CONTROLLER
     try:
         request_string = JsonSerializer.Serialize(e.Data)
         request_object = json.loads(request_string)
@@ -404,6 +469,8 @@ def initialize_app():
 # --- Application Start ---
 PostMessage("backend:clear", '')
 container = initialize_app()
+# Resolved once; onMessage reuses it instead of going through the provider per message
+_CONTROLLER = container.app_controller()
 PostMessage("backend:info", "Backend Python script (Refactored) initialized successfully.")
 
 # endregion
\ No newline at end of file